@@ -1,12 +1,36 @@
+import asyncio
+import sys
 import time
+import typing
 from pathlib import Path
 
 import blessed
 
 import boxed
-from boxed.screens import credits, game, main_menu, tutorial, victory
+from boxed import sound
+from boxed.app import App
+from boxed.constants import SESSION_PATH
+from boxed.frame import write
+from boxed.screens import main_menu
 from boxed.utils import get_int_input
 
+# Screens other than the menu are imported once they're first shown, so the game starts quicker
+if typing.TYPE_CHECKING:
+    from boxed.screens.game import GameTracker
+
+if sys.argv[1:2] == ["generate"]:
+    from boxed import bulk
+
+    sys.exit(bulk.main(sys.argv[2:]))
+elif sys.argv[1:2] == ["benchmark"]:
+    from boxed import benchmark
+
+    sys.exit(benchmark.main(sys.argv[2:]))
+elif sys.argv[1:2] == ["replay"]:
+    from boxed import recording
+
+    sys.exit(recording.main(sys.argv[2:]))
+
 boxed.terminal = blessed.Terminal()
 try:
     import msvcrt
@@ -29,7 +53,7 @@ except ModuleNotFoundError:
     pass
 
 
-menu_options = ["Play", "How to play", "Credits", "Quit"]
+menu_options = ["Play", "Resume", "How to play", "Credits", "Quit"]
 
 authors = {
     "Aaris-Kazi": "https://github.com/Aaris-Kazi",
@@ -40,32 +64,84 @@ authors = {
     "SystematicError": "https://github.com/SystematicError",
 }
 
-try:
-    while True:
-        action = main_menu.load_screen(menu_options)
 
-        if action == 0:    # Level selector
-            cell_size = get_int_input("Enter cell size: ", 10, boxed.terminal.height//2)
-            width = get_int_input("Enter grid width: ", 10, boxed.terminal.height//2)
-            height = get_int_input("Enter grid height: ", 10, boxed.terminal.height//2)
-            recursive_elements = get_int_input(
+async def play(game_tracker: "GameTracker") -> None:
+    """
+    Play the game of `game_tracker`, recording it if the BOXED_RECORD environment variable is set.
+
+    The session is saved when the game is left unfinished, and the save is removed once it's won.
+    """
+    from boxed import recording, session
+    from boxed.screens import game, victory
+
+    directory = recording.recording_directory()
+    recorder = recording.Recorder(game_tracker) if directory is not None else None
+    try:
+        # Returns true when game is won, the session is saved when it's left unfinished
+        if await game.load_screen(application, game_tracker, session.save, recorder):
+            SESSION_PATH.unlink(missing_ok=True)
+            await victory.load_screen(application)
+    finally:
+        if recorder is not None:
+            recording.save_recording(recorder, directory)
+
+
+async def main() -> None:
+    """Show the main menu and the screens picked from it until quit is selected."""
+    # Loading the audio is left until the first frame of the menu is drawn
+    asyncio.get_running_loop().call_soon(sound.preload)
+    while True:
+        # Resume is only offered when there's a saved session
+        options = [option for option in menu_options if option != "Resume" or SESSION_PATH.exists()]
+        action = options[await main_menu.load_screen(application, options)]
+
+        if action == "Play":    # Level selector
+            cell_size = await get_int_input(application, "Enter cell size: ", 10, boxed.terminal.height//2)
+            width = await get_int_input(application, "Enter grid width: ", 10, boxed.terminal.height//2)
+            height = await get_int_input(application, "Enter grid height: ", 10, boxed.terminal.height//2)
+            recursive_elements = await get_int_input(
+                application,
                 "Enter difficulty (number of recursive cells on main puzzle): ",
                 10,
                 boxed.terminal.height//2
             )
-            if game.load_screen(cell_size, width, height, recursive_elements):    # Returns true when game is won
-                victory.load_screen()
+            from boxed.generation import GENERATORS
+            from boxed.screens import game
+
+            generator = GENERATORS[
+                await main_menu.load_screen(
+                    application, [name.replace("_", " ").capitalize() + " generator" for name in GENERATORS]
+                )
+            ]
+            await play(game.create_game_tracker(cell_size, width, height, recursive_elements, generator))
+
+        elif action == "Resume":    # Continue the saved session
+            from boxed import session
 
-        elif action == 1:    # Tutorial
-            tutorial.load_screen(Path("tutorial.txt"))
+            try:
+                game_tracker = session.load(SESSION_PATH)
+            except (OSError, session.SessionError):
+                SESSION_PATH.unlink(missing_ok=True)
+                continue
+            await play(game_tracker)
 
-        elif action == 2:    # Credits
-            credits.load_screen(authors)
+        elif action == "How to play":    # Tutorial
+            from boxed.screens import tutorial
 
-        elif action == 3:    # Quit Menu
-            raise KeyboardInterrupt()
+            await tutorial.load_screen(application, Path("tutorial.txt"))
 
+        elif action == "Credits":
+            from boxed.screens import credits
 
+            await credits.load_screen(application, authors)
+
+        elif action == "Quit":    # Quit Menu
+            return
+
+application = App()
+try:
+    application.run(main())
 except KeyboardInterrupt:
-    print(boxed.terminal.move_xy(0, boxed.terminal.height), end="")
-    print(boxed.terminal.clear, end="")
+    pass
+finally:
+    write(boxed.terminal.move_xy(0, boxed.terminal.height), boxed.terminal.clear)
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import signal
+import sys
+import threading
+import typing
+
+import blessed.keyboard
+
+import boxed
+from boxed import layout
+from boxed.frame import frame
+from boxed.headless import HeadlessTerminal, KeysExhausted
+
+# How often the terminal size is checked on platforms without SIGWINCH
+RESIZE_POLL_INTERVAL = 0.25
+# Resize signals closer together than this are handled as one
+RESIZE_DEBOUNCE = 0.1
+
+
+class Screen:
+    """
+    A screen shown by `App.show`.
+
+    The screen is drawn whole by `draw` when it's shown and when the terminal is resized,
+    and reacts to keys in `on_key` until it calls `finish`.
+    Everything drawn by either of them is written to the terminal as a single frame.
+    """
+
+    app: App
+
+    def draw(self) -> None:
+        """Draw the whole screen."""
+
+    def on_key(self, key: blessed.keyboard.Keystroke) -> None:
+        """React to `key` being pressed."""
+
+    def finish(self, result: object = None) -> None:
+        """Stop showing this screen, with `App.show` returning `result`."""
+        self.app.finish(result)
+
+
+class App:
+    """
+    Run screens on an asyncio event loop which wakes up only when a key is pressed or the terminal is resized.
+
+    The terminal is switched to cbreak mode and the cursor is hidden for the whole `run`.
+    Resizes are handled once the terminal stops changing size for `RESIZE_DEBOUNCE` seconds,
+    by invalidating the cached layouts and drawing the shown screen again.
+
+    With a `HeadlessTerminal` the keys scripted before `run` are passed to the screens as fast as they take them,
+    and `KeysExhausted` is raised once a screen waits for a key after all of them were used.
+    """
+
+    def __init__(self):
+        self._screen: typing.Optional[Screen] = None
+        self._result: typing.Optional[asyncio.Future] = None
+        self._pending_keys: collections.deque[blessed.keyboard.Keystroke] = collections.deque()
+        self._terminal_size = 0, 0
+        self._resize_handle: typing.Optional[asyncio.TimerHandle] = None
+        self._headless = False
+
+    def run(self, main: typing.Coroutine[object, object, object]) -> object:
+        """Run the `main` coroutine, which shows screens with `show`, and return its result."""
+        with boxed.terminal.cbreak(), boxed.terminal.hidden_cursor():
+            return asyncio.run(self._run(main))
+
+    async def show(self, screen: Screen) -> object:
+        """Show `screen` until it finishes, returning its result."""
+        loop = asyncio.get_running_loop()
+        screen.app = self
+        self._screen = screen
+        self._result = loop.create_future()
+        if (size := (boxed.terminal.width, boxed.terminal.height)) != self._terminal_size:
+            self._terminal_size = size
+            layout.invalidate()
+        try:
+            with frame():
+                screen.draw()
+            # Keys pressed while the previous screen was finishing go to this one
+            loop.call_soon(self._dispatch_keys)
+            return await self._result
+        finally:
+            self._screen = None
+
+    def finish(self, result: object = None) -> None:
+        """Finish the shown screen with `result`."""
+        if self._result is not None and not self._result.done():
+            self._result.set_result(result)
+
+    async def _run(self, main: typing.Coroutine[object, object, object]) -> object:
+        loop = asyncio.get_running_loop()
+        if isinstance(boxed.terminal, HeadlessTerminal):
+            self._headless = True
+            self._read_keys()
+            return await main
+
+        try:
+            loop.add_reader(sys.stdin.fileno(), self._read_keys)
+        except (NotImplementedError, ValueError, OSError):
+            # Windows event loops can't watch the console, read it from a thread instead
+            watching_stdin = False
+            threading.Thread(target=self._read_keys_blocking, args=(loop,), daemon=True).start()
+        else:
+            watching_stdin = True
+            self._read_keys()
+
+        try:
+            loop.add_signal_handler(signal.SIGWINCH, self._on_resize_signal, loop)
+        except (AttributeError, NotImplementedError):
+            self._poll_size(loop)
+
+        try:
+            return await main
+        finally:
+            if watching_stdin:
+                loop.remove_reader(sys.stdin.fileno())
+
+    def _read_keys(self) -> None:
+        """Read all keys which can be read without blocking."""
+        while key := boxed.terminal.inkey(timeout=0):
+            self._pending_keys.append(key)
+        self._dispatch_keys()
+
+    def _read_keys_blocking(self, loop: asyncio.AbstractEventLoop) -> None:
+        while True:
+            key = boxed.terminal.inkey()
+            if key:
+                self._pending_keys.append(key)
+                loop.call_soon_threadsafe(self._dispatch_keys)
+
+    def _dispatch_keys(self) -> None:
+        """Pass pending keys to the shown screen until it finishes."""
+        while self._pending_keys and self._result is not None and not self._result.done():
+            self._call_screen(self._screen.on_key, self._pending_keys.popleft())
+        if self._headless and self._result is not None and not self._result.done():
+            self._result.set_exception(KeysExhausted())
+
+    def _on_resize_signal(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Delay the resize check until no resize signal arrived for `RESIZE_DEBOUNCE` seconds."""
+        if self._resize_handle is not None:
+            self._resize_handle.cancel()
+        self._resize_handle = loop.call_later(RESIZE_DEBOUNCE, self._check_size)
+
+    def _check_size(self) -> None:
+        """Invalidate the cached layouts and redraw the shown screen if the terminal was resized."""
+        self._resize_handle = None
+        if (size := (boxed.terminal.width, boxed.terminal.height)) != self._terminal_size:
+            self._terminal_size = size
+            layout.invalidate()
+            if self._result is not None and not self._result.done():
+                self._call_screen(self._screen.draw)
+
+    def _poll_size(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._check_size()
+        loop.call_later(RESIZE_POLL_INTERVAL, self._poll_size, loop)
+
+    def _call_screen(self, method: typing.Callable, *args: object) -> None:
+        """Call `method` of the shown screen in a frame, failing the screen if it raises."""
+        try:
+            with frame():
+                method(*args)
+        except Exception as error:
+            if self._result is not None and not self._result.done():
+                self._result.set_exception(error)
@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import argparse
+import collections.abc
+import json
+import os
+import random
+import select
+import statistics
+import struct
+import subprocess  # noqa: S404
+import sys
+import time
+import tracemalloc
+import typing
+
+import boxed
+from boxed import grid, layout
+from boxed.app import App
+from boxed.generation import PathGenerator
+from boxed.headless import HeadlessTerminal
+from boxed.screens import main_menu
+from boxed.screens.game import Game, GameTracker, load_screen
+
+DEFAULT_SIZES = (4, 10, 50, 100, 200)
+DEFAULT_CELL_SIZES = (1, 2)
+# Slowdowns over this ratio are reported as regressions when comparing against a baseline.
+REGRESSION_THRESHOLD = 1.1
+# Size of the pseudo terminal the startup is measured in
+STARTUP_TERMINAL_SIZE = (100, 40)
+# Part of the last line of the main menu, the first frame is complete once it's written
+STARTUP_MARKER = b"navigate"
+CURSOR_POSITION_REQUEST = b"\x1b[6n"
+
+
+class Benchmark(typing.NamedTuple):
+    """
+    A benchmark of a single operation.
+
+    `setup` is called with the width and height of the board and the cell size,
+    and returns the function that's measured.
+    """
+
+    name: str
+    setup: typing.Callable[[int, int], typing.Callable[[], object]]
+    renders: bool = False
+
+
+def _new_game(size: int, cell_size: int, generator: str = "path") -> Game:
+    game = Game(grid.Grid(grid.GridDimensions(cell_size, size, size)), 3, generator, seed=size)
+    game.start_game()
+    return game
+
+
+def _generate_path(size: int, cell_size: int) -> typing.Callable[[], object]:
+    board = grid.Grid(grid.GridDimensions(cell_size, size, size))
+    path_generator = PathGenerator(board, random.Random(size))
+    return lambda: path_generator.generate_path(board.cell_at(0, 0), board.cell_at(size - 1, size - 1))
+
+
+def _generate_path_with_length(size: int, cell_size: int) -> typing.Callable[[], object]:
+    board = grid.Grid(grid.GridDimensions(cell_size, size, size))
+    path_generator = PathGenerator(board, random.Random(size))
+    start, end = board.cell_at(0, 0), board.cell_at(size - 1, size - 1)
+    distance = board.distance_between(start, end)
+    return lambda: path_generator.generate_path_with_length(start, end, int(distance * 1.2), int(size * size * 0.75))
+
+
+def _verify_path(size: int, cell_size: int) -> typing.Callable[[], object]:
+    game = _new_game(size, cell_size)
+    for cell1, cell2 in zip(game.path, game.path[1:]):
+        if not game.grid.cells_connected(cell1, cell2):
+            game.grid.create_cell_opening(cell1, cell2)
+    return lambda: game._path_gen.verify_path(game.start, game.end)
+
+
+def _solved_after_rotation(size: int, cell_size: int) -> typing.Callable[[], object]:
+    game = _new_game(size, cell_size)
+    cell = game.path[len(game.path) // 2]
+
+    def run() -> bool:
+        cell.openings.rotate()
+        return game.solved(cache=False)
+    return run
+
+
+def _start_game(generator: str) -> typing.Callable[[int, int], typing.Callable[[], object]]:
+    def setup(size: int, cell_size: int) -> typing.Callable[[], object]:
+        game = Game(grid.Grid(grid.GridDimensions(cell_size, size, size)), 3, generator, seed=size)
+        return game.start_game
+    return setup
+
+
+def _print_grid(size: int, cell_size: int) -> typing.Callable[[], object]:
+    return _new_game(size, cell_size).grid.print_grid
+
+
+def _generate_cell_lines(size: int, cell_size: int) -> typing.Callable[[], object]:
+    board = _new_game(size, cell_size).grid
+
+    def run() -> None:
+        grid.cell_lines.cache_clear()
+        for cell in board:
+            cell.generate_cell_lines()
+    return run
+
+
+def _display(size: int, cell_size: int) -> typing.Callable[[], object]:
+    game = _new_game(size, cell_size)
+    return lambda: game.display(0)
+
+
+def _rotate_keypress(size: int, cell_size: int) -> typing.Callable[[], object]:
+    game = _new_game(size, cell_size)
+    game.display(0)
+    game.current_selection = game.grid.cell_at(size // 2, size // 2)
+
+    def run() -> None:
+        game.current_selection.openings.rotate()
+        game.display_selection()
+    return run
+
+
+def _main_menu(size: int, cell_size: int) -> typing.Callable[[], object]:
+    return main_menu.MainMenuScreen(["Play", "Resume", "How to play", "Credits", "Quit"]).draw
+
+
+def _game_screen_keys(size: int, cell_size: int) -> typing.Callable[[], object]:
+    game_tracker = GameTracker(_new_game(size, cell_size), None, cell_size)
+    # Moves diagonally rotating cells on the way, then stops the game, leaving any entered recursive cells first
+    keys = ("\x1b[C", " ", "\x1b[B", " ") * 10 + ("s",) * 4
+
+    def run() -> None:
+        nonlocal game_tracker
+        while game_tracker.parent is not None:
+            game_tracker = game_tracker.parent_tracker()
+        boxed.terminal.press(*keys)
+        app = App()
+        app.run(load_screen(app, game_tracker))
+    return run
+
+
+BENCHMARKS = (
+    Benchmark("generate_path", _generate_path),
+    Benchmark("generate_path_with_length", _generate_path_with_length),
+    Benchmark("verify_path", _verify_path),
+    Benchmark("solved_after_rotation", _solved_after_rotation),
+    Benchmark("start_game_path", _start_game("path")),
+    Benchmark("start_game_spanning_tree", _start_game("spanning_tree")),
+    Benchmark("generate_cell_lines", _generate_cell_lines, renders=True),
+    Benchmark("print_grid", _print_grid, renders=True),
+    Benchmark("display", _display, renders=True),
+    Benchmark("rotate_keypress", _rotate_keypress, renders=True),
+    Benchmark("main_menu", _main_menu),
+    Benchmark("game_screen_keys", _game_screen_keys, renders=True),
+)
+
+
+def run_benchmark(benchmark: Benchmark, size: int, cell_size: int, repeat: int) -> dict[str, typing.Any]:
+    """
+    Run `benchmark` on a `size` by `size` board with `cell_size` against a headless terminal.
+
+    The function is timed `repeat` times, then run once more while tracing allocations.
+    """
+    dimensions = grid.GridDimensions(cell_size, size, size)
+    boxed.terminal = HeadlessTerminal(dimensions.char_width + 4, dimensions.char_height + 4)
+    layout.invalidate()
+    run = benchmark.setup(size, cell_size)
+
+    times = []
+    stream = boxed.terminal.stream
+    for _ in range(repeat):
+        stream.reset()
+        start_time = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start_time)
+    output_bytes, output_writes = stream.bytes_written, stream.writes
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak_allocated = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "name": benchmark.name,
+        "size": size,
+        "cell_size": cell_size,
+        "median_time": statistics.median(times),
+        "min_time": min(times),
+        "peak_allocated_bytes": peak_allocated,
+        "output_bytes": output_bytes,
+        "output_writes": output_writes,
+    }
+
+
+def measure_startup(repeat: int) -> dict[str, typing.Any]:
+    """
+    Time starting the game in a pseudo terminal until the first frame of the main menu is written, `repeat` times.
+
+    blessed probes the terminal when it's created and waits for the cursor position it requests,
+    the pseudo terminal answers the request right away like a real terminal would.
+    Only available on platforms with the pty module.
+    """
+    import fcntl
+    import pty
+    import termios
+
+    width, height = STARTUP_TERMINAL_SIZE
+    times = []
+    for _ in range(repeat):
+        controller, child = pty.openpty()
+        fcntl.ioctl(child, termios.TIOCSWINSZ, struct.pack("HHHH", height, width, 0, 0))
+        start_time = time.perf_counter()
+        process = subprocess.Popen(  # noqa: S603
+            [sys.executable, "-m", "boxed"], stdin=child, stdout=child, stderr=child, start_new_session=True
+        )
+        os.close(child)
+        output = b""
+        try:
+            while STARTUP_MARKER not in output:
+                if not select.select([controller], [], [], 30)[0]:
+                    raise RuntimeError("The main menu wasn't drawn within 30 seconds.")
+                data = os.read(controller, 65536)
+                if CURSOR_POSITION_REQUEST in data:
+                    os.write(controller, b"\x1b[1;1R")
+                output += data
+            times.append(time.perf_counter() - start_time)
+        finally:
+            process.kill()
+            process.wait()
+            os.close(controller)
+
+    return {
+        "name": "startup",
+        "size": 0,
+        "cell_size": 0,
+        "median_time": statistics.median(times),
+        "min_time": min(times),
+        "output_bytes": len(output),
+    }
+
+
+def compare(results: list[dict[str, typing.Any]], baseline: list[dict[str, typing.Any]]) -> list[str]:
+    """Get lines comparing the median times of `results` against `baseline`, marking regressions."""
+    baseline_times = {
+        (result["name"], result["size"], result["cell_size"]): result["median_time"] for result in baseline
+    }
+    lines = []
+    for result in results:
+        key = result["name"], result["size"], result["cell_size"]
+        if key not in baseline_times or not baseline_times[key]:
+            continue
+        ratio = result["median_time"] / baseline_times[key]
+        marker = "  REGRESSION" if ratio > REGRESSION_THRESHOLD else ""
+        lines.append(f"{key[0]:<28}{key[1]:>4}x{key[1]:<4} cell {key[2]}  {ratio:6.2f}x{marker}")
+    return lines
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create the parser of the benchmark command's arguments."""
+    parser = argparse.ArgumentParser(
+        prog="python -m boxed benchmark", description="Benchmark startup, generation, solving and rendering."
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="widths and heights of the measured boards"
+    )
+    parser.add_argument(
+        "--cell-sizes", type=int, nargs="+", default=DEFAULT_CELL_SIZES, help="cell sizes of rendering benchmarks"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="times every benchmark is timed (default: 5)")
+    parser.add_argument("--filter", default="", help="only run benchmarks with names containing this")
+    parser.add_argument("--output", help="file the results are saved to as JSON")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    return parser
+
+
+def main(arguments: collections.abc.Sequence[str]) -> int:
+    """Run the benchmark command with command line `arguments`, returning 1 if a regression was found."""
+    options = create_parser().parse_args(arguments)
+    # Screens play sounds, which would only add noise to the measurements
+    os.environ.setdefault("BOXED_AUDIO", "0")
+    results = []
+    if options.filter in "startup" and sys.platform != "win32":
+        result = measure_startup(options.repeat)
+        results.append(result)
+        print(
+            f"{'startup':<28}{'':>14}  {result['median_time'] * 1000:10.3f}ms  {'':>13}  {result['output_bytes']:>10}B"
+        )
+
+    for benchmark in BENCHMARKS:
+        if options.filter not in benchmark.name:
+            continue
+        for size in options.sizes:
+            # Only rendering depends on the size of cells.
+            for cell_size in options.cell_sizes if benchmark.renders else options.cell_sizes[:1]:
+                result = run_benchmark(benchmark, size, cell_size, options.repeat)
+                results.append(result)
+                print(
+                    f"{result['name']:<28}{size:>4}x{size:<4} cell {cell_size}  "
+                    f"{result['median_time'] * 1000:10.3f}ms  "
+                    f"{result['peak_allocated_bytes'] / 1024:10.1f}KiB  "
+                    f"{result['output_bytes']:>10}B"
+                )
+
+    if options.output:
+        with open(options.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if options.baseline:
+        with open(options.baseline) as file:
+            comparison = compare(results, json.load(file))
+        print("\nCompared to the baseline:")
+        print("\n".join(comparison))
+        if any(line.endswith("REGRESSION") for line in comparison):
+            return 1
+    return 0
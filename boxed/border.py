@@ -1,37 +1,28 @@
 import boxed
 from boxed.constants import WBorder
+from boxed.frame import write
 
 
 def draw_boundary() -> None:
     """Prints a border around the app."""
-    # Upper edge
-    print(boxed.terminal.move_xy(0, 0), WBorder.HORIZONTAL * (boxed.terminal.width - 1))
-
-    # Left and Right edges
-    for row in range(boxed.terminal.height - 2):
-        print(
-            WBorder.VERTICAL,
-            boxed.terminal.move_right(boxed.terminal.width - 4),
-            WBorder.VERTICAL,
+    width, height = boxed.terminal.width, boxed.terminal.height
+    horizontal = WBorder.HORIZONTAL * (width - 2)
+    parts = [boxed.terminal.move_xy(0, 0), WBorder.DOWN_AND_RIGHT, horizontal, WBorder.DOWN_AND_LEFT]
+
+    # Left and Right edges, with a space of padding on the inside
+    for row in range(1, height - 2):
+        parts.extend(
+            (
+                boxed.terminal.move_xy(0, row),
+                WBorder.VERTICAL,
+                " ",
+                boxed.terminal.move_xy(width - 2, row),
+                " ",
+                WBorder.VERTICAL,
+            )
         )
 
-    # Bottom edge
-    print(
-        boxed.terminal.move_xy(0, boxed.terminal.height - 2),
-        WBorder.HORIZONTAL * (boxed.terminal.width - 1),
-    )
-
-    # Top left corner
-    print(boxed.terminal.move_xy(0, 0) + WBorder.DOWN_AND_RIGHT)
-
-    # Top right corner
-    print(boxed.terminal.move_xy(boxed.terminal.width - 1, 0) + WBorder.DOWN_AND_LEFT)
-
-    # Bottom left corner
-    print(boxed.terminal.move_xy(0, boxed.terminal.height - 2) + WBorder.UP_AND_RIGHT)
-
-    # Bottom right corner
-    print(
-        boxed.terminal.move_xy(boxed.terminal.width - 1, boxed.terminal.height - 2)
-        + WBorder.UP_AND_LEFT
+    parts.extend(
+        (boxed.terminal.move_xy(0, height - 2), WBorder.UP_AND_RIGHT, horizontal, WBorder.UP_AND_LEFT)
     )
+    write(*parts)
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import argparse
+import collections.abc
+import concurrent.futures
+import os
+import random
+import struct
+import time
+import typing
+
+from boxed import grid
+from boxed.generation import GENERATORS
+from boxed.metrics import percentile
+from boxed.screens.game import Game
+
+FILE_HEADER = struct.Struct("<4sB")
+FILE_MAGIC = b"BXDB"
+FILE_VERSION = 1
+# seed, width, height, start index, end index, amount of recursive cells
+BOARD_HEADER = struct.Struct("<QHHIIH")
+RECURSIVE_INDEX = struct.Struct("<I")
+
+
+class BoardJob(typing.NamedTuple):
+    """Parameters of a single board to generate."""
+
+    width: int
+    height: int
+    difficulty: int
+    generator: str
+    seed: int
+
+
+def generate_board(job: BoardJob) -> tuple[bytes, float, int]:
+    """
+    Generate the board described by `job`.
+
+    Return it encoded with `encode_board`, its generation time and the amount of attempts its path took.
+    """
+    start_time = time.perf_counter()
+    game = Game(grid.Grid(grid.GridDimensions(1, job.width, job.height)), job.difficulty, job.generator, job.seed)
+    game.start_game()
+    return encode_board(game), time.perf_counter() - start_time, game.path_attempts
+
+
+def encode_board(game: Game) -> bytes:
+    """
+    Encode the board of `game`.
+
+    The board is stored as a `BOARD_HEADER`, the indices of the recursive cells
+    and the openings of its cells packed by `Grid.packed_openings`.
+    """
+    dimensions = game.grid.dimensions
+    return b"".join(
+        (
+            BOARD_HEADER.pack(
+                game.seed,
+                dimensions.width,
+                dimensions.height,
+                game.start.index,
+                game.end.index,
+                len(game.recursive_cells),
+            ),
+            *(RECURSIVE_INDEX.pack(cell.index) for cell in game.recursive_cells),
+            game.grid.packed_openings(),
+        )
+    )
+
+
+def parse_size(size: str) -> tuple[int, int]:
+    """Parse a board size in the WIDTHxHEIGHT format."""
+    try:
+        width, height = (int(part) for part in size.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid size {size!r}, expected WIDTHxHEIGHT.")
+    # The start and end would be next to each other on narrower boards, which can't be scrambled apart
+    if width < 3 or height < 1:
+        raise argparse.ArgumentTypeError(f"Invalid size {size!r}, boards need to be at least 3 cells wide.")
+    return width, height
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create the parser of the generate command's arguments."""
+    parser = argparse.ArgumentParser(
+        prog="python -m boxed generate", description="Generate boards in bulk without a terminal."
+    )
+    parser.add_argument(
+        "--size",
+        type=parse_size,
+        action="append",
+        help="size of the boards as WIDTHxHEIGHT, can be passed multiple times (default: 10x10)",
+    )
+    parser.add_argument("--count", type=int, default=100, help="amount of boards of every size (default: 100)")
+    parser.add_argument(
+        "--difficulty", type=int, default=3, help="amount of recursive cells on every board (default: 3)"
+    )
+    parser.add_argument("--generator", choices=GENERATORS, default="path", help="board generator (default: path)")
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count(), help="amount of worker processes (default: CPU count)"
+    )
+    parser.add_argument("--seed", type=int, help="seed the seeds of the boards are picked from (default: random)")
+    parser.add_argument(
+        "--output", default="boards.bxd", help="file the boards are written to (default: boards.bxd)"
+    )
+    return parser
+
+
+def main(arguments: collections.abc.Sequence[str]) -> int:
+    """Run the generate command with command line `arguments`."""
+    options = create_parser().parse_args(arguments)
+    sizes = options.size or [(10, 10)]
+    seeds = random.Random(options.seed)
+    jobs = [
+        BoardJob(width, height, options.difficulty, options.generator, seeds.getrandbits(64))
+        for width, height in sizes
+        for _ in range(options.count)
+    ]
+
+    latencies = collections.defaultdict(list)
+    attempts = collections.defaultdict(list)
+    start_time = time.perf_counter()
+    with open(options.output, "wb") as file, concurrent.futures.ProcessPoolExecutor(options.workers) as executor:
+        file.write(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION))
+        chunk_size = max(1, len(jobs) // (options.workers * 8))
+        # Boards are written in the order of the jobs as they're finished.
+        for job, (board, latency, path_attempts) in zip(
+            jobs, executor.map(generate_board, jobs, chunksize=chunk_size)
+        ):
+            file.write(board)
+            latencies[job.width, job.height].append(latency)
+            attempts[job.width, job.height].append(path_attempts)
+    elapsed = time.perf_counter() - start_time
+
+    print(
+        f"Generated {len(jobs)} boards in {elapsed:.2f}s with {options.workers} workers, "
+        f"{len(jobs) / elapsed:.1f} boards/s."
+    )
+    for (width, height), size_latencies in latencies.items():
+        size_attempts = attempts[width, height]
+        print(
+            f"{width}x{height}: "
+            + ", ".join(
+                f"p{percent} {percentile(size_latencies, percent) * 1000:.2f}ms" for percent in (50, 90, 99)
+            )
+            + f", path attempts mean {sum(size_attempts) / len(size_attempts):.2f} max {max(size_attempts)}"
+        )
+    return 0
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import array
+import typing
+
+from boxed.grid import Direction, Grid
+
+
+class ConnectivityTracker:
+    """
+    Keep track of which cells of `grid` are connected through their openings.
+
+    Every cell carries the label of its connected component, so checking whether two cells are connected
+    is a single comparison. Once attached to the grid, a change to a cell only relabels
+    the components that were touching the cell.
+    """
+
+    def __init__(self, grid: Grid):
+        self.grid = grid
+        self.labels = array.array("i", (0,)) * len(grid)
+        self._links = bytearray(len(grid))
+        self._sizes = {}
+        self._next_label = 0
+        self._stale = False
+
+    def attach(self) -> None:
+        """Start following changes to the grid's cells, the tracker is expected to be up to date."""
+        if self.cell_changed not in self.grid.observers:
+            self.grid.observers.append(self.cell_changed)
+
+    def detach(self) -> None:
+        """Stop following changes to the grid's cells."""
+        if self.cell_changed in self.grid.observers:
+            self.grid.observers.remove(self.cell_changed)
+
+    def invalidate(self) -> None:
+        """Mark the labels as out of date, they're rebuilt when connectivity is checked next."""
+        self._stale = True
+
+    def connected(self, index1: int, index2: int) -> bool:
+        """Check if the cells at `index1` and `index2` are connected."""
+        if self._stale:
+            self.rebuild()
+        return self.labels[index1] == self.labels[index2]
+
+    def rebuild(self) -> None:
+        """Relabel all components of the grid from scratch."""
+        self._stale = False
+        self._sizes.clear()
+        states = self.grid.states
+        links = self._links
+        links[:] = bytes(len(links))
+        for direction, table in enumerate(self.grid.neighbours):
+            opposite = direction ^ 2
+            for index, neighbour in enumerate(table):
+                if neighbour != -1 and states[index] >> direction & 1 and states[neighbour] >> opposite & 1:
+                    links[index] |= 1 << direction
+        for index in range(len(self.grid)):
+            self.labels[index] = -1
+        for index in range(len(self.grid)):
+            if self.labels[index] == -1:
+                label = self._new_label()
+                self._sizes[label] = self._flood(index, label)
+
+    def cell_changed(self, index: int) -> None:
+        """Update the components around the cell at `index` after its openings changed."""
+        if self._stale:
+            return
+        old_links = self._links[index]
+        new_links = self._cell_links(index)
+        if old_links == new_links:
+            return
+
+        self._links[index] = new_links
+        for direction in Direction:
+            if (old_links ^ new_links) >> direction & 1:
+                self._links[self.grid.neighbours[direction][index]] ^= 1 << (direction ^ 2)
+
+        removed = old_links & ~new_links
+        if not removed:
+            # Only new connections, merge the smaller components into the largest one.
+            component_cells = {self.labels[index]: index}
+            for direction in Direction:
+                if new_links >> direction & 1:
+                    neighbour = self.grid.neighbours[direction][index]
+                    component_cells.setdefault(self.labels[neighbour], neighbour)
+            kept_label = max(component_cells, key=self._sizes.__getitem__)
+            for label, cell_index in component_cells.items():
+                if label != kept_label:
+                    del self._sizes[label]
+                    self._sizes[kept_label] += self._flood(cell_index, kept_label, label)
+            return
+
+        # The component of the cell may have been split, relabel everything reachable from the cell
+        # and from the neighbours it was disconnected from.
+        old_label = self.labels[index]
+        stale_labels = {old_label}
+        for direction in Direction:
+            if new_links >> direction & 1:
+                stale_labels.add(self.labels[self.grid.neighbours[direction][index]])
+        for label in stale_labels:
+            self._sizes.pop(label, None)
+        label = self._new_label()
+        self._sizes[label] = self._flood(index, label)
+        for direction in Direction:
+            if removed >> direction & 1:
+                neighbour = self.grid.neighbours[direction][index]
+                if self.labels[neighbour] == old_label:
+                    label = self._new_label()
+                    self._sizes[label] = self._flood(neighbour, label)
+
+    def _cell_links(self, index: int) -> int:
+        """Get the bit mask of directions in which the cell at `index` is connected to its neighbours."""
+        links = 0
+        for direction in Direction:
+            if self.grid.connected(index, direction):
+                links |= 1 << direction
+        return links
+
+    def _new_label(self) -> int:
+        self._next_label += 1
+        return self._next_label
+
+    def _flood(self, index: int, label: int, source_label: typing.Optional[int] = None) -> int:
+        """
+        Assign `label` to every cell connected to the cell at `index` and return the amount of relabelled cells.
+
+        If `source_label` is given, only cells currently labelled with it are relabelled.
+        """
+        labels = self.labels
+        links = self._links
+        neighbours = self.grid.neighbours
+        labels[index] = label
+        stack = [index]
+        size = 0
+        while stack:
+            current = stack.pop()
+            size += 1
+            cell_links = links[current]
+            for direction in range(4):
+                if cell_links >> direction & 1:
+                    neighbour = neighbours[direction][current]
+                    neighbour_label = labels[neighbour]
+                    if neighbour_label != label and (source_label is None or neighbour_label == source_label):
+                        labels[neighbour] = label
+                        stack.append(neighbour)
+        return size
@@ -1,4 +1,8 @@
 import enum
+from pathlib import Path
+
+# Where the game is saved when it's stopped, and resumed from
+SESSION_PATH = Path("session.bxs")
 
 
 class Border(str, enum.Enum):
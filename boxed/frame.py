@@ -0,0 +1,78 @@
+import contextlib
+import os
+import time
+import typing
+
+import boxed
+from boxed import metrics
+from boxed.layout import layout_cache
+
+BEGIN_SYNCHRONIZED_UPDATE = "\x1b[?2026h"
+END_SYNCHRONIZED_UPDATE = "\x1b[?2026l"
+
+# Terminals known to implement synchronized updates, matched against $TERM and $TERM_PROGRAM
+_SYNCHRONIZED_TERMINALS = ("alacritty", "contour", "foot", "iterm", "kitty", "wezterm")
+
+_buffer = []
+_depth = 0
+
+
+@layout_cache
+def supports_synchronized_output() -> bool:
+    """
+    Check if the terminal supports synchronized updates.
+
+    The detection can be overridden by setting the BOXED_SYNCHRONIZED_OUTPUT environment variable to 0 or 1.
+    The result is kept until `layout.invalidate` is called, like when the terminal is replaced.
+    """
+    setting = os.environ.get("BOXED_SYNCHRONIZED_OUTPUT")
+    if setting is not None:
+        return setting == "1"
+    if not boxed.terminal.is_a_tty:
+        return False
+    if os.environ.get("WT_SESSION"):  # Windows Terminal
+        return True
+    names = (os.environ.get("TERM", "") + " " + os.environ.get("TERM_PROGRAM", "")).lower()
+    return any(name in names for name in _SYNCHRONIZED_TERMINALS)
+
+
+def write(*parts: str) -> None:
+    """Write `parts` to the current frame, or directly to the terminal if no frame is open."""
+    if _depth:
+        _buffer.extend(parts)
+    else:
+        _write_out("".join(parts))
+
+
+@contextlib.contextmanager
+def frame() -> typing.Iterator[None]:
+    """
+    Collect everything written until the context exits and write it to the terminal at once.
+
+    On terminals which support it the frame is wrapped in a synchronized update so it's never shown half drawn.
+    Nested frames are merged into the outermost one.
+    The time taken by frames and the bytes they wrote are recorded as the frame_time and frame_bytes metrics.
+    """
+    global _depth
+    if not _depth:
+        start_time = time.perf_counter()
+    _depth += 1
+    try:
+        yield
+    finally:
+        _depth -= 1
+        if not _depth:
+            data = "".join(_buffer)
+            _buffer.clear()
+            if data:
+                if supports_synchronized_output():
+                    data = BEGIN_SYNCHRONIZED_UPDATE + data + END_SYNCHRONIZED_UPDATE
+                _write_out(data)
+                metrics.record("frame_time", time.perf_counter() - start_time)
+                metrics.record("frame_bytes", len(data.encode()))
+
+
+def _write_out(data: str) -> None:
+    stream = boxed.terminal.stream
+    stream.write(data)
+    stream.flush()
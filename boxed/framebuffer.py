@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import typing
+
+from boxed import raster, sequences
+from boxed.grid import Cell, Direction, Grid
+
+# A priority and a colour, when cells share a border the one with the higher priority is drawn over the other.
+CellStyle = tuple[int, typing.Callable[[str], str]]
+
+
+class GridFrameBuffer:
+    """
+    Retain what was last drawn for every cell of `grid` and only redraw cells which changed.
+
+    `style` is called with a cell and returns its `CellStyle`.
+    Cells are marked for a check with `invalidate`, and `render` returns the escape sequences
+    which bring the cells whose glyphs or colours differ from the last frame up to date.
+    Only cells in the grid's viewport are drawn, so the cost of a frame doesn't depend on the size of the grid.
+    """
+
+    def __init__(self, grid: Grid, style: typing.Callable[[Cell], CellStyle]):
+        self.grid = grid
+        self._style = style
+        self._front: dict[int, tuple[tuple[str, ...], typing.Callable[[str], str]]] = {}
+        self._dirty = set()
+
+    def invalidate(self, *cells: Cell) -> None:
+        """Mark `cells` to be checked for changes on the next render."""
+        self._dirty.update(cell.index for cell in cells)
+
+    def invalidate_index(self, index: int) -> None:
+        """Mark the cell at `index` and its neighbours, whose edges it shares, to be checked on the next render."""
+        self._dirty.add(index)
+        for table in self.grid.neighbours:
+            if (neighbour := table[index]) != -1:
+                self._dirty.add(neighbour)
+
+    def reset(self) -> None:
+        """Forget the drawn frame, causing the next render to draw all visible cells."""
+        self._front.clear()
+        self._dirty = set(self.grid.viewport.visible_indices())
+
+    def render(self) -> str:
+        """Get the escape sequences which draw every changed cell."""
+        styles = {}
+
+        def style_of(index: int) -> CellStyle:
+            if index not in styles:
+                styles[index] = self._style(self.grid.cell(index))
+            return styles[index]
+
+        width = self.grid.dimensions.width
+        viewport = self.grid.viewport
+
+        def visible(index: int) -> bool:
+            y_pos, x_pos = divmod(index, width)
+            return viewport.contains(x_pos, y_pos)
+
+        drawn = set()
+        if len(self._dirty) == len(self.grid) and raster.should_rasterize(self.grid):
+            cell_lines = raster.cell_lines_by_index(self.grid)
+        else:
+            cell_lines = None
+        if not self._front and self._dirty.issuperset(viewport.visible_indices()):
+            self._dirty.clear()
+            return self._render_all(style_of, cell_lines)
+
+        for index in self._dirty:
+            if not visible(index):
+                continue
+            if cell_lines is not None:
+                state = (cell_lines[index], style_of(index)[1])
+            else:
+                state = (tuple(self.grid.cell(index).generate_cell_lines()), style_of(index)[1])
+            if self._front.get(index) != state:
+                self._front[index] = state
+                drawn.add(index)
+        self._dirty.clear()
+
+        # Drawing a cell overwrites the borders it shares with its neighbours,
+        # the neighbours which should be on top of it have to be drawn again.
+        pending = list(drawn)
+        while pending:
+            index = pending.pop()
+            priority = style_of(index)[0]
+            for neighbour in self._surrounding(index):
+                if neighbour not in drawn and visible(neighbour) and style_of(neighbour)[0] > priority:
+                    if neighbour not in self._front:
+                        self._front[neighbour] = (
+                            tuple(self.grid.cell(neighbour).generate_cell_lines()), style_of(neighbour)[1]
+                        )
+                    drawn.add(neighbour)
+                    pending.append(neighbour)
+
+        return self._draw_cells(sorted(drawn, key=lambda index: (style_of(index)[0], index)))
+
+    def _render_all(
+        self,
+        style_of: typing.Callable[[int], CellStyle],
+        cell_lines: typing.Optional[list[tuple[str, ...]]],
+    ) -> str:
+        """
+        Draw every visible cell, like `Grid.print_grid` a whole row of cells per line of the terminal.
+
+        Moving the cursor to every line of every cell makes up most of a full redraw, so the rows are drawn
+        first with the cells in index order, like the lowest priority is drawn by `render`,
+        and the cells with a higher priority are then drawn over them.
+        """
+        grid = self.grid
+        cell_size = grid.dimensions.cell_size
+        width = grid.dimensions.width
+        columns, rows = grid.viewport.visible_ranges()
+        x, y = grid.viewport.cell_start(columns.start, rows.start)
+        move_left = sequences.move_left()
+
+        output = []
+        raised = []
+        for row, y_pos in enumerate(rows):
+            row_states = []
+            for x_pos in columns:
+                index = y_pos * width + x_pos
+                if cell_lines is not None:
+                    lines = cell_lines[index]
+                else:
+                    lines = tuple(Cell(x_pos, y_pos, grid).generate_cell_lines())
+                priority, colour = style_of(index)
+                self._front[index] = (lines, colour)
+                row_states.append((lines, colour))
+                if priority:
+                    raised.append(index)
+            for line_pos in range(cell_size + 2):
+                output.append(sequences.move_xy(x, y + line_pos + row * (cell_size + 1)))
+                current = None
+                suffix = ""
+                for lines, colour in row_states:
+                    if current is not None:
+                        # After every cell, move one character left to overlap edges.
+                        output.append(move_left)
+                    if colour is not current:
+                        prefix, next_suffix = sequences.colour_affixes(colour)
+                        output.append(suffix + prefix)
+                        current, suffix = colour, next_suffix
+                    output.append(lines[line_pos])
+                output.append(suffix)
+
+        output.append(self._draw_cells(sorted(raised, key=lambda index: (style_of(index)[0], index))))
+        return "".join(output)
+
+    def _draw_cells(self, indices: list[int]) -> str:
+        """Draw the cells at `indices` in order, as they were last drawn."""
+        output = []
+        for index in indices:
+            lines, colour = self._front[index]
+            prefix, suffix = sequences.colour_affixes(colour)
+            x, y = self.grid.cell(index).get_cell_start()
+            for row, line in enumerate(lines):
+                output.append(sequences.move_xy(x, y + row) + prefix + line + suffix)
+        return "".join(output)
+
+    def _surrounding(self, index: int) -> typing.Iterator[int]:
+        """Get the indices of all cells around the cell at `index`, including diagonal ones."""
+        neighbours = self.grid.neighbours
+        for direction in Direction:
+            if (neighbour := neighbours[direction][index]) != -1:
+                yield neighbour
+                diagonal = neighbours[(direction + 1) % 4][neighbour]
+                if diagonal != -1:
+                    yield diagonal
@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import collections
+import collections.abc
+import hashlib
+import random
+import typing
+
+from boxed.grid import OPENINGS_MASK, ROTATED_MASKS, Cell, Direction, Grid
+
+# Names of the ways a board can be generated, selectable per game.
+GENERATORS = ("path", "spanning_tree")
+
+
+def derive_seed(seed: int, x_pos: int, y_pos: int) -> int:
+    """
+    Derive the seed of the game inside of the cell at `x_pos`, `y_pos` of a game generated from `seed`.
+
+    Seeds of games at any depth can be derived from the seed of the root game and the positions of the cells
+    leading to them.
+    """
+    digest = hashlib.blake2b(f"{seed}:{x_pos}:{y_pos}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class GeneratedPath(typing.NamedTuple):
+    """A generated path and the amount of attempts it took to generate it."""
+
+    cells: list[Cell]
+    attempts: int
+
+
+class PathGenerator:
+    """
+    Generate and verify paths between points on `grid`.
+
+    Random choices are taken from `rng`, or from a new unseeded generator if it's not given.
+    """
+
+    def __init__(self, grid: Grid, rng: typing.Optional[random.Random] = None):
+        self.grid = grid
+        self.rng = rng or random.Random()
+        self.visited_cells = set()
+
+    def neighbours(self, cell: Cell) -> collections.abc.Iterable[Cell]:
+        """Get all neighbours around `cell`."""
+        for table in self.grid.neighbours:
+            if (index := table[cell.index]) != -1:
+                yield self.grid.cell(index)
+
+    def generate_path(self, start: Cell, end: Cell) -> list[Cell]:
+        """
+        Generate a random path between `start` and `end`.
+
+        Both start and end are included in the resulting path
+        """
+        visited_cells = {start}
+        path = [start]
+        current_cell = start
+        while current_cell != end:
+            valid_neighbours = tuple(
+                cell
+                for cell in self.neighbours(current_cell)
+                if cell not in visited_cells
+            )
+
+            if not valid_neighbours:
+                for current_cell in reversed(path.copy()):
+                    valid_neighbours = tuple(
+                        cell
+                        for cell in self.neighbours(current_cell)
+                        if cell not in visited_cells
+                    )
+                    if valid_neighbours:
+                        break
+                    else:
+                        path.pop()
+
+            current_cell = self.rng.choice(valid_neighbours)
+            visited_cells.add(current_cell)
+            path.append(current_cell)
+        return path
+
+    def verify_path(self, start: Cell, end: Cell) -> bool:
+        """Valid path between start and end exists."""
+        visited_cells = {start}
+        path = [start]
+        current_cell = start
+        while current_cell != end:
+            valid_neighbours = tuple(
+                cell
+                for cell in self.neighbours(current_cell)
+                if cell not in visited_cells
+                and self.grid.cells_connected(cell, current_cell)
+            )
+            if not valid_neighbours:
+                for current_cell in reversed(path.copy()):
+                    valid_neighbours = tuple(
+                        cell
+                        for cell in self.neighbours(current_cell)
+                        if cell not in visited_cells
+                        and self.grid.cells_connected(cell, current_cell)
+                    )
+                    if valid_neighbours:
+                        break
+                    else:
+                        path.pop()
+                else:
+                    return False
+
+            current_cell = min(
+                valid_neighbours,
+                key=lambda c: self.grid.distance_between(c, current_cell),
+            )
+            visited_cells.add(current_cell)
+            path.append(current_cell)
+        return True
+
+    def generate_path_with_length(
+        self, start: Cell, end: Cell, min_length: int, max_length: int, *, max_attempts: int = 10
+    ) -> GeneratedPath:
+        """
+        Generate a random path between `start` and `end` with a length between `min_length` and `max_length`.
+
+        A random shortest path is extended with detours around pairs of free cells next to it until it reaches
+        a random target length. Every detour adds two cells, so the target keeps the parity of the shortest path.
+        If the target can't be reached, the whole path is generated again up to `max_attempts` times
+        after which the path closest to the length range is used.
+        The lengths count the cells on the path, including `start` and `end`.
+        """
+        shortest_length = self.grid.distance_between(start, end) + 1
+        best_path = None
+        for attempt in range(1, max_attempts + 1):
+            low = max(min_length, shortest_length)
+            high = max(max_length, low)
+            target = self.rng.randint(low, high)
+            if (target - shortest_length) % 2:
+                target += 1 if target < high else -1
+            path = self._extend_path(self._shortest_path(start, end), target)
+
+            if min_length <= len(path) <= max_length:
+                return GeneratedPath([self.grid.cell(index) for index in path], attempt)
+            if best_path is None or _length_error(len(path), min_length, max_length) < _length_error(
+                len(best_path), min_length, max_length
+            ):
+                best_path = path
+
+        return GeneratedPath([self.grid.cell(index) for index in best_path], max_attempts)
+
+    def _shortest_path(self, start: Cell, end: Cell) -> list[int]:
+        """Get the indices of a random shortest path between `start` and `end`."""
+        horizontal = Direction.RIGHT if end.x_pos > start.x_pos else Direction.LEFT
+        vertical = Direction.DOWN if end.y_pos > start.y_pos else Direction.UP
+        steps = [horizontal] * abs(end.x_pos - start.x_pos) + [vertical] * abs(end.y_pos - start.y_pos)
+        self.rng.shuffle(steps)
+
+        path = [start.index]
+        for direction in steps:
+            path.append(self.grid.neighbours[direction][path[-1]])
+        return path
+
+    def _extend_path(self, path: list[int], target: int) -> list[int]:
+        """
+        Extend `path` with detours until it holds `target` cells or no detour can be made.
+
+        A detour replaces the step between two consecutive cells of the path with a step into the two free cells
+        next to them on the same side. Cells only ever join the path, so a step which can't take a detour
+        on either side never will and is dropped from the candidates.
+        """
+        neighbours = self.grid.neighbours
+        following = dict(zip(path, path[1:]))
+        on_path = bytearray(len(self.grid))
+        for index in path:
+            on_path[index] = 1
+        steps = path[:-1]  # Cells of the steps which may still take a detour, in any order.
+        length = len(path)
+
+        while length < target and steps:
+            position = self.rng.randrange(len(steps))
+            index = steps[position]
+            next_index = following[index]
+            direction = self._direction_to(index, next_index)
+            turn = self.rng.choice((1, 3))
+            for side in ((direction + turn) % 4, (direction - turn) % 4):
+                side_index = neighbours[side][index]
+                side_next_index = neighbours[side][next_index]
+                if side_index != -1 and side_next_index != -1 and not on_path[side_index] | on_path[side_next_index]:
+                    following[index] = side_index
+                    following[side_index] = side_next_index
+                    following[side_next_index] = next_index
+                    on_path[side_index] = on_path[side_next_index] = 1
+                    steps.append(side_index)
+                    steps.append(side_next_index)
+                    length += 2
+                    break
+            else:
+                steps[position] = steps[-1]
+                steps.pop()
+
+        extended = [path[0]]
+        while extended[-1] != path[-1]:
+            extended.append(following[extended[-1]])
+        return extended
+
+    def _direction_to(self, index: int, neighbour: int) -> int:
+        """Get the direction from the cell at `index` to its neighbour at `neighbour`."""
+        for direction, table in enumerate(self.grid.neighbours):
+            if table[index] == neighbour:
+                return direction
+        raise ValueError("The cells aren't neighbours.")
+
+
+class SpanningTreeGenerator:
+    """
+    Generate boards on `grid` from a random spanning tree of its cells.
+
+    Every cell is opened towards its tree neighbours and all cells are then scrambled once,
+    so the time taken only depends on the amount of cells.
+    Random choices are taken from `rng`, or from a new unseeded generator if it's not given.
+    """
+
+    def __init__(self, grid: Grid, rng: typing.Optional[random.Random] = None):
+        self.grid = grid
+        self.rng = rng or random.Random()
+
+    def generate(self, start: Cell, end: Cell) -> list[Cell]:
+        """
+        Open the edges of a random spanning tree, scramble the cells and return the tree's path from `start` to `end`.
+
+        `start` is attached to the tree as a leaf of the cell right of it, or of the cell above or below it
+        if the cell right of it is `end`. That cell is left with at most three openings, so it can always be
+        scrambled into a rotation which isn't connected to `start`, which guarantees the board isn't solved
+        after the single scrambling pass. A ValueError is raised for boards where `start` can only be
+        attached to `end`, those would always start solved.
+        """
+        grid = self.grid
+        neighbours = grid.neighbours
+        side = Direction.RIGHT
+        if neighbours[side][start.index] == end.index:
+            sides = [side for side in (Direction.UP, Direction.DOWN) if neighbours[side][start.index] != -1]
+            if not sides:
+                raise ValueError("The start can only be connected to the end, the board would always be solved.")
+            side = self.rng.choice(sides)
+        first = neighbours[side][start.index]
+        parents = list(range(len(grid)))
+
+        def find(index: int) -> int:
+            while parents[index] != index:
+                parents[index] = parents[parents[index]]
+                index = parents[index]
+            return index
+
+        # Randomized Kruskal's algorithm over the edges to the right and below every cell.
+        edges = [
+            (index, direction)
+            for direction in (Direction.RIGHT, Direction.DOWN)
+            for index in range(len(grid))
+            if neighbours[direction][index] != -1
+        ]
+        self.rng.shuffle(edges)
+
+        if first != -1:
+            grid.reverse_opening(start.index, side)
+            grid.reverse_opening(first, side.opposite())
+            parents[start.index] = first
+        first_degree = 1
+        for index, direction in edges:
+            neighbour = neighbours[direction][index]
+            if first != -1 and (start.index == index or start.index == neighbour):
+                continue
+            is_first_edge = first == index or first == neighbour
+            if is_first_edge and first_degree == 3:
+                continue
+            root, neighbour_root = find(index), find(neighbour)
+            if root != neighbour_root:
+                parents[root] = neighbour_root
+                grid.reverse_opening(index, direction)
+                grid.reverse_opening(neighbour, direction ^ 2)
+                if is_first_edge:
+                    first_degree += 1
+
+        path = self._tree_path(start.index, end.index)
+
+        for index in range(len(grid)):
+            grid.rotate(index, self.rng.randrange(4))
+        if first != -1 and side.opposite() in grid.cell(first).openings:
+            mask = grid.states[first] & OPENINGS_MASK
+            grid.rotate(
+                first,
+                self.rng.choice([n for n in range(1, 4) if not ROTATED_MASKS[n][mask] >> side.opposite() & 1]),
+            )
+
+        return [grid.cell(index) for index in path]
+
+    def _tree_path(self, start: int, end: int) -> list[int]:
+        """Get the indices of the cells on the path between `start` and `end` through the open edges."""
+        neighbours = self.grid.neighbours
+        states = self.grid.states
+        previous = {start: start}
+        queue = collections.deque((start,))
+        while queue:
+            current = queue.popleft()
+            if current == end:
+                break
+            for direction in range(4):
+                if states[current] >> direction & 1:
+                    neighbour = neighbours[direction][current]
+                    if neighbour != -1 and neighbour not in previous:
+                        previous[neighbour] = current
+                        queue.append(neighbour)
+
+        path = [end]
+        while path[-1] != start:
+            path.append(previous[path[-1]])
+        path.reverse()
+        return path
+
+
+def _length_error(length: int, min_length: int, max_length: int) -> int:
+    """Get how far `length` is outside of the range between `min_length` and `max_length`."""
+    return max(min_length - length, length - max_length, 0)
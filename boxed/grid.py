@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import array
 import collections.abc
 import enum
+import functools
 import typing
 
 import boxed
+from boxed import raster, sequences
 from boxed.constants import WBorder
+from boxed.frame import write
+from boxed.layout import layout_cache
 
 WIDTH_MULTIPLIER = 3
 
@@ -39,86 +44,251 @@ class GridDimensions(typing.NamedTuple):
         return (self.cell_size * WIDTH_MULTIPLIER + 1) * self.width + 1
 
 
+OPENINGS_MASK = 0b1111
+ROTATABLE_FLAG = 0b1_0000
+RECURSIVE_FLAG = 0b10_0000
+
+# ROTATED_MASKS[n][mask] is `mask` rotated clockwise by `n` steps,
+# bit `d` of a mask is set when the opening in `Direction(d)` is present.
+ROTATED_MASKS = tuple(
+    tuple(((mask << n) | (mask >> (4 - n))) & OPENINGS_MASK for mask in range(16))
+    for n in range(4)
+)
+# Tables for `bytes.translate` splitting bytes of `Grid.packed_openings` into the openings of their two cells
+_LOW_OPENINGS = bytes(packed & OPENINGS_MASK for packed in range(256))
+_HIGH_OPENINGS = bytes(packed >> 4 for packed in range(256))
+
+
+@functools.lru_cache(maxsize=None)
+def neighbour_table(width: int, height: int) -> tuple[array.array, ...]:
+    """
+    Get the neighbour index tables for a `width` by `height` grid.
+
+    The table for a direction holds the index of the neighbouring cell in that direction
+    for every cell index, or -1 where the cell is at an edge.
+    Grids of the same size share the tables.
+    """
+    tables = []
+    for direction in Direction:
+        table = array.array("i")
+        for y_pos in range(height):
+            for x_pos in range(width):
+                if direction is Direction.UP:
+                    target = (x_pos, y_pos - 1)
+                elif direction is Direction.RIGHT:
+                    target = (x_pos + 1, y_pos)
+                elif direction is Direction.DOWN:
+                    target = (x_pos, y_pos + 1)
+                else:
+                    target = (x_pos - 1, y_pos)
+                if 0 <= target[0] < width and 0 <= target[1] < height:
+                    table.append(target[1] * width + target[0])
+                else:
+                    table.append(-1)
+        tables.append(table)
+    return tuple(tables)
+
+
+def _edge_centers(own_only: WBorder, neighbour_only: WBorder, closed: WBorder) -> tuple[WBorder, ...]:
+    """
+    Create the table of center pieces of an edge.
+
+    The table is indexed by the opening bit of the cell, the opening bit of the neighbour
+    sharing the edge shifted left by one, and whether the neighbour exists shifted left by two.
+    Openings to the outside of the grid are drawn as connected.
+    """
+    table = []
+    for key in range(8):
+        own, neighbour_open, neighbour_exists = key & 1, key >> 1 & 1, key >> 2 & 1
+        if own and (not neighbour_exists or neighbour_open):
+            table.append(WBorder.VERTICAL_AND_HORIZONTAL)
+        elif own:
+            table.append(own_only)
+        elif neighbour_exists and neighbour_open:
+            table.append(neighbour_only)
+        else:
+            table.append(closed)
+    return tuple(table)
+
+
+# Center pieces of edges, indexed by direction and then as described in `_edge_centers`
+EDGE_CENTERS = (
+    _edge_centers(WBorder.DOWN_AND_HORIZONTAL, WBorder.UP_AND_HORIZONTAL, WBorder.HORIZONTAL),
+    _edge_centers(WBorder.VERTICAL_AND_LEFT, WBorder.VERTICAL_AND_RIGHT, WBorder.VERTICAL),
+    _edge_centers(WBorder.UP_AND_HORIZONTAL, WBorder.DOWN_AND_HORIZONTAL, WBorder.HORIZONTAL),
+    _edge_centers(WBorder.VERTICAL_AND_RIGHT, WBorder.VERTICAL_AND_LEFT, WBorder.VERTICAL),
+)
+
+# Top left, top right, bottom left and bottom right corners of cells,
+# indexed by the `_edge_class` of the row and then of the column of the cell
+CORNERS = (
+    (
+        (
+            WBorder.DOWN_AND_RIGHT,
+            WBorder.DOWN_AND_HORIZONTAL,
+            WBorder.VERTICAL_AND_RIGHT,
+            WBorder.VERTICAL_AND_HORIZONTAL,
+        ),
+        (
+            WBorder.DOWN_AND_HORIZONTAL,
+            WBorder.DOWN_AND_HORIZONTAL,
+            WBorder.VERTICAL_AND_HORIZONTAL,
+            WBorder.VERTICAL_AND_HORIZONTAL,
+        ),
+        (
+            WBorder.DOWN_AND_HORIZONTAL,
+            WBorder.DOWN_AND_LEFT,
+            WBorder.VERTICAL_AND_HORIZONTAL,
+            WBorder.VERTICAL_AND_LEFT,
+        ),
+    ),
+    (
+        (
+            WBorder.VERTICAL_AND_RIGHT,
+            WBorder.VERTICAL_AND_HORIZONTAL,
+            WBorder.VERTICAL_AND_RIGHT,
+            WBorder.VERTICAL_AND_HORIZONTAL,
+        ),
+        (
+            WBorder.VERTICAL_AND_HORIZONTAL,
+            WBorder.VERTICAL_AND_HORIZONTAL,
+            WBorder.VERTICAL_AND_HORIZONTAL,
+            WBorder.VERTICAL_AND_HORIZONTAL,
+        ),
+        (
+            WBorder.VERTICAL_AND_HORIZONTAL,
+            WBorder.VERTICAL_AND_LEFT,
+            WBorder.VERTICAL_AND_HORIZONTAL,
+            WBorder.VERTICAL_AND_LEFT,
+        ),
+    ),
+    (
+        (
+            WBorder.VERTICAL_AND_RIGHT,
+            WBorder.VERTICAL_AND_HORIZONTAL,
+            WBorder.UP_AND_RIGHT,
+            WBorder.UP_AND_HORIZONTAL,
+        ),
+        (
+            WBorder.VERTICAL_AND_HORIZONTAL,
+            WBorder.VERTICAL_AND_HORIZONTAL,
+            WBorder.UP_AND_HORIZONTAL,
+            WBorder.UP_AND_HORIZONTAL,
+        ),
+        (
+            WBorder.VERTICAL_AND_HORIZONTAL,
+            WBorder.VERTICAL_AND_LEFT,
+            WBorder.UP_AND_HORIZONTAL,
+            WBorder.UP_AND_LEFT,
+        ),
+    ),
+)
+
+
+def _edge_class(position: int, size: int) -> int:
+    """Get whether `position` is on the first (0), a middle (1) or the last (2) row or column out of `size`."""
+    if position == 0:
+        return 0
+    elif position == size - 1:
+        return 2
+    return 1
+
+
 class CellOpenings:
     """Provide an interface for openings of a cell with the ability to rotate them and check for their presence."""
 
-    def __init__(self):
-        self._openings = collections.deque((False, False, False, False))
-        self.rotatable = True
+    __slots__ = ("_grid", "_index")
+
+    def __init__(self, grid: Grid, index: int):
+        self._grid = grid
+        self._index = index
+
+    @property
+    def mask(self) -> int:
+        """Bit mask of the present openings."""
+        return self._grid.states[self._index] & OPENINGS_MASK
+
+    @property
+    def rotatable(self) -> bool:
+        """Whether the openings are rotated by `rotate`."""
+        return bool(self._grid.states[self._index] & ROTATABLE_FLAG)
+
+    @rotatable.setter
+    def rotatable(self, value: bool) -> None:
+        if value:
+            self._grid.states[self._index] |= ROTATABLE_FLAG
+        else:
+            self._grid.states[self._index] &= ~ROTATABLE_FLAG
 
     def reset_openings(self) -> None:
         """Reset all openings to the closed state."""
-        self._openings = collections.deque((False, False, False, False))
+        self._grid.reset_openings(self._index)
 
     def reverse_opening(self, opening: Direction) -> None:
         """Reverse the current state of `opening`."""
-        self._openings[opening] = not self._openings[opening]
+        self._grid.reverse_opening(self._index, opening)
 
     def rotate(self, n: int = 1) -> None:
         """Rotate the openings by `n` rotations clockwise."""
-        if self.rotatable:
-            self._openings.rotate(n)
+        self._grid.rotate(self._index, n)
 
     def __contains__(self, item: Direction):
-        return self._openings[item]
+        return bool(self._grid.states[self._index] >> item & 1)
 
     def __repr__(self):
         return "".join(
             (
                 "<CellOpenings ",
-                ", ".join(f"{dir_.name}={self._openings[dir_]}" for dir_ in Direction),
+                ", ".join(f"{dir_.name}={dir_ in self}" for dir_ in Direction),
                 ">",
             )
         )
 
 
 class Cell:
-    """Manage a single cell in a grid defined by `grid_dimensions`."""
+    """
+    A view of a single cell in `grid`.
+
+    The state of the cell lives in the grid, views of the same cell compare equal.
+    """
+
+    __slots__ = ("x_pos", "y_pos", "index", "_grid")
 
     def __init__(self, x_pos: int, y_pos: int, grid: Grid):
-        self.size = grid.dimensions.cell_size
         self.x_pos = x_pos
         self.y_pos = y_pos
-        self.openings = CellOpenings()
+        self.index = y_pos * grid.dimensions.width + x_pos
         self._grid = grid
 
-    def generate_cell_lines(self) -> collections.abc.Iterable[str]:
-        """Create the text representation of the cell as individual lines."""
-        top_left, top_right, bottom_left, bottom_right = self.get_corners()
-        modifier_size = self.size * WIDTH_MULTIPLIER
-
-        yield "".join(
-            (
-                top_left,
-                WBorder.HORIZONTAL * (modifier_size // 2 - (1 - modifier_size % 2)),
-                self.get_edge_center(Direction.UP),
-                WBorder.HORIZONTAL * (modifier_size // 2),
-                top_right,
-            )
-        )
-
-        for _ in range(self.size // 2 - (1 - modifier_size % 2)):
-            yield "".join((WBorder.VERTICAL, " " * modifier_size, WBorder.VERTICAL))
+    @property
+    def size(self) -> int:
+        """Size of the cell."""
+        return self._grid.dimensions.cell_size
 
-        yield "".join(
-            (
-                self.get_edge_center(Direction.LEFT),
-                " " * modifier_size,
-                self.get_edge_center(Direction.RIGHT),
-            )
-        )
+    @property
+    def openings(self) -> CellOpenings:
+        """Openings of the cell."""
+        return CellOpenings(self._grid, self.index)
 
-        for _ in range(self.size // 2):
-            yield "".join((WBorder.VERTICAL, " " * modifier_size, WBorder.VERTICAL))
+    @property
+    def recursive(self) -> bool:
+        """Whether the cell holds a child puzzle."""
+        return bool(self._grid.states[self.index] & RECURSIVE_FLAG)
+
+    @recursive.setter
+    def recursive(self, value: bool) -> None:
+        if value:
+            self._grid.states[self.index] |= RECURSIVE_FLAG
+        else:
+            self._grid.states[self.index] &= ~RECURSIVE_FLAG
 
-        yield "".join(
-            (
-                bottom_left,
-                WBorder.HORIZONTAL * (modifier_size // 2 - (1 - modifier_size % 2)),
-                self.get_edge_center(Direction.DOWN),
-                WBorder.HORIZONTAL * (modifier_size // 2),
-                bottom_right,
-            )
+    def generate_cell_lines(self) -> tuple[str, ...]:
+        """Create the text representation of the cell as individual lines."""
+        grid = self._grid
+        return cell_lines(
+            self.size,
+            grid.corners(self.index),
+            tuple(grid.edge_center(self.index, direction) for direction in Direction),
         )
 
     def render(self, colour: typing.Optional[typing.Callable] = None) -> None:
@@ -126,202 +296,182 @@ class Cell:
         x, y = self.get_cell_start()
         if colour is None:
             colour = boxed.terminal.white_on_black
-        for row, line in enumerate(self.generate_cell_lines()):
-            print(boxed.terminal.move_xy(x, y + row), end="")
-            print(colour("".join(line)))
+        prefix, suffix = sequences.colour_affixes(colour)
+        write(
+            *(
+                sequences.move_xy(x, y + row) + prefix + line + suffix
+                for row, line in enumerate(self.generate_cell_lines())
+            )
+        )
 
     def get_cell_start(self) -> tuple[int, int]:
         """Get the coordinates of the left corner of cell."""
-        x, y = grid_center_offset_coords(self._grid.dimensions)
-        x += (
-            self._grid.dimensions.cell_size * WIDTH_MULTIPLIER * self.x_pos
-        ) + self.x_pos
-        y += (self._grid.dimensions.cell_size * self.y_pos) + self.y_pos
-        return x, y
+        return self._grid.viewport.cell_start(self.x_pos, self.y_pos)
 
     def get_corners(self) -> tuple[WBorder, WBorder, WBorder, WBorder]:
         """Get the corner borders of the cell."""
-        if self.x_pos == 0:
-            if self.y_pos == 0:
-                return (
-                    WBorder.DOWN_AND_RIGHT,
-                    WBorder.DOWN_AND_HORIZONTAL,
-                    WBorder.VERTICAL_AND_RIGHT,
-                    WBorder.VERTICAL_AND_HORIZONTAL,
-                )
-            elif self.y_pos == self._grid.dimensions.height - 1:
-                return (
-                    WBorder.VERTICAL_AND_RIGHT,
-                    WBorder.VERTICAL_AND_HORIZONTAL,
-                    WBorder.UP_AND_RIGHT,
-                    WBorder.UP_AND_HORIZONTAL,
-                )
-            else:
-                return (
-                    WBorder.VERTICAL_AND_RIGHT,
-                    WBorder.VERTICAL_AND_HORIZONTAL,
-                    WBorder.VERTICAL_AND_RIGHT,
-                    WBorder.VERTICAL_AND_HORIZONTAL,
-                )
-
-        elif self.x_pos == self._grid.dimensions.width - 1:
-            if self.y_pos == 0:
-                return (
-                    WBorder.DOWN_AND_HORIZONTAL,
-                    WBorder.DOWN_AND_LEFT,
-                    WBorder.VERTICAL_AND_HORIZONTAL,
-                    WBorder.VERTICAL_AND_LEFT,
-                )
-            elif self.y_pos == self._grid.dimensions.height - 1:
-                return (
-                    WBorder.VERTICAL_AND_HORIZONTAL,
-                    WBorder.VERTICAL_AND_LEFT,
-                    WBorder.UP_AND_HORIZONTAL,
-                    WBorder.UP_AND_LEFT,
-                )
-            else:
-                return (
-                    WBorder.VERTICAL_AND_HORIZONTAL,
-                    WBorder.VERTICAL_AND_LEFT,
-                    WBorder.VERTICAL_AND_HORIZONTAL,
-                    WBorder.VERTICAL_AND_LEFT,
-                )
-        else:
-            if self.y_pos == 0:
-                return (
-                    WBorder.DOWN_AND_HORIZONTAL,
-                    WBorder.DOWN_AND_HORIZONTAL,
-                    WBorder.VERTICAL_AND_HORIZONTAL,
-                    WBorder.VERTICAL_AND_HORIZONTAL,
-                )
-            elif self.y_pos == self._grid.dimensions.height - 1:
-                return (
-                    WBorder.VERTICAL_AND_HORIZONTAL,
-                    WBorder.VERTICAL_AND_HORIZONTAL,
-                    WBorder.UP_AND_HORIZONTAL,
-                    WBorder.UP_AND_HORIZONTAL,
-                )
-            else:
-                return (
-                    WBorder.VERTICAL_AND_HORIZONTAL,
-                    WBorder.VERTICAL_AND_HORIZONTAL,
-                    WBorder.VERTICAL_AND_HORIZONTAL,
-                    WBorder.VERTICAL_AND_HORIZONTAL,
-                )
+        return self._grid.corners(self.index)
 
     def get_edge_center(self, edge_loc: Direction) -> WBorder:
         """Get the required center piece of an edge with the openings defined by `self.openings`."""
-        if edge_loc is Direction.UP:
-            neighbour = self._grid.cell_in_direction(self, edge_loc)
-            if edge_loc in self.openings and (
-                neighbour is None or self._grid.cells_connected(self, neighbour)
-            ):
-                return WBorder.VERTICAL_AND_HORIZONTAL
-            elif edge_loc in self.openings:
-                return WBorder.DOWN_AND_HORIZONTAL
-            elif neighbour is not None and edge_loc.opposite() in neighbour.openings:
-                return WBorder.UP_AND_HORIZONTAL
-            else:
-                return WBorder.HORIZONTAL
+        return self._grid.edge_center(self.index, edge_loc)
 
-        elif edge_loc is Direction.DOWN:
-            neighbour = self._grid.cell_in_direction(self, edge_loc)
-            if edge_loc in self.openings and (
-                neighbour is None or self._grid.cells_connected(self, neighbour)
-            ):
-                return WBorder.VERTICAL_AND_HORIZONTAL
-            elif edge_loc in self.openings:
-                return WBorder.UP_AND_HORIZONTAL
-            elif neighbour is not None and edge_loc.opposite() in neighbour.openings:
-                return WBorder.DOWN_AND_HORIZONTAL
-            else:
-                return WBorder.HORIZONTAL
+    def __eq__(self, other: object):
+        if not isinstance(other, Cell):
+            return NotImplemented
+        return self.index == other.index and self._grid is other._grid
 
-        elif edge_loc is Direction.LEFT:
-            neighbour = self._grid.cell_in_direction(self, edge_loc)
-            if edge_loc in self.openings and (
-                neighbour is None or self._grid.cells_connected(self, neighbour)
-            ):
-                return WBorder.VERTICAL_AND_HORIZONTAL
-            elif edge_loc in self.openings:
-                return WBorder.VERTICAL_AND_RIGHT
-            elif neighbour is not None and edge_loc.opposite() in neighbour.openings:
-                return WBorder.VERTICAL_AND_LEFT
-            else:
-                return WBorder.VERTICAL
-
-        else:
-            neighbour = self._grid.cell_in_direction(self, edge_loc)
-            if edge_loc in self.openings and (
-                neighbour is None or self._grid.cells_connected(self, neighbour)
-            ):
-                return WBorder.VERTICAL_AND_HORIZONTAL
-            elif edge_loc in self.openings:
-                return WBorder.VERTICAL_AND_LEFT
-            elif neighbour is not None and edge_loc.opposite() in neighbour.openings:
-                return WBorder.VERTICAL_AND_RIGHT
-            else:
-                return WBorder.VERTICAL
+    def __hash__(self):
+        return hash(self.index)
 
     def __repr__(self):
         return f"<Cell x={self.x_pos}, y={self.y_pos}, size={self.size}, openings={self.openings}>"
 
 
-class Grid:
-    """A grid of `Cell`s defined by `dimensions`."""
+class Viewport:
+    """
+    The part of a grid with `dimensions` which is drawn on the terminal.
+
+    The viewport shows as many cells as fit into the terminal, starting at the column `left` and the row `top`,
+    and is centered in the terminal. Grids which fit whole are drawn exactly as if there was no viewport.
+    """
 
     def __init__(self, dimensions: GridDimensions):
         self.dimensions = dimensions
-        self.cells = []
-
-        for y_pos in range(dimensions.height):
-            row = []
-            for x_pos in range(dimensions.width):
-                row.append(Cell(x_pos, y_pos, self))
-            self.cells.append(row)
+        self.left = 0
+        self.top = 0
 
-    def print_grid(self) -> bool:
+    def follow(self, x_pos: int, y_pos: int) -> bool:
         """
-        Print all cells in a centered grid.
+        Scroll so the cell at `x_pos`, `y_pos` is visible.
 
-        Return True if the grid was displayed, False otherwise.
+        A cell outside of the viewport is scrolled to its center, so moving along the viewport's edge
+        doesn't scroll on every step. Return True if the viewport moved.
         """
-        print(
-            boxed.terminal.move_xy(
-                boxed.terminal.width // 2 - 18, boxed.terminal.height // 2
-            ),
-            end="",
+        visible = visible_dimensions(self.dimensions)
+        left = _scroll_position(self.left, x_pos, visible.width, self.dimensions.width)
+        top = _scroll_position(self.top, y_pos, visible.height, self.dimensions.height)
+        moved = (left, top) != (self.left, self.top)
+        self.left, self.top = left, top
+        return moved
+
+    def shows_all(self) -> bool:
+        """Check if the whole grid is visible."""
+        return visible_dimensions(self.dimensions) == self.dimensions
+
+    def contains(self, x_pos: int, y_pos: int) -> bool:
+        """Check if the cell at `x_pos`, `y_pos` is visible."""
+        visible = visible_dimensions(self.dimensions)
+        return (
+            self.left <= x_pos < self.left + visible.width
+            and self.top <= y_pos < self.top + visible.height
         )
 
-        if self.dimensions.char_width > boxed.terminal.width - 2:
-            print("Your terminal's width is too small!")
+    def visible_ranges(self) -> tuple[range, range]:
+        """Get the ranges of the visible columns and rows."""
+        visible = visible_dimensions(self.dimensions)
+        return range(self.left, self.left + visible.width), range(self.top, self.top + visible.height)
+
+    def visible_indices(self) -> list[int]:
+        """Get the indices of all visible cells."""
+        columns, rows = self.visible_ranges()
+        return [y_pos * self.dimensions.width + x_pos for y_pos in rows for x_pos in columns]
+
+    def cell_start(self, x_pos: int, y_pos: int) -> tuple[int, int]:
+        """Get the coordinates of the top left corner of the cell at `x_pos`, `y_pos`."""
+        x, y = grid_center_offset_coords(visible_dimensions(self.dimensions))
+        x += (self.dimensions.cell_size * WIDTH_MULTIPLIER + 1) * (x_pos - self.left)
+        y += (self.dimensions.cell_size + 1) * (y_pos - self.top)
+        return x, y
+
+
+class Grid:
+    """
+    A grid of `Cell`s defined by `dimensions`.
+
+    The state of every cell is packed into a single byte of `states`,
+    the low four bits hold the openings and the rest hold the `ROTATABLE_FLAG` and `RECURSIVE_FLAG` flags.
+    Callables in `observers` are called with the index of every cell whose openings change.
+    """
+
+    def __init__(self, dimensions: GridDimensions):
+        self.dimensions = dimensions
+        self.states = bytearray((ROTATABLE_FLAG,)) * (dimensions.width * dimensions.height)
+        self.neighbours = neighbour_table(dimensions.width, dimensions.height)
+        self.observers: list[typing.Callable[[int], None]] = []
+        self.viewport = Viewport(dimensions)
+
+    @property
+    def cells(self) -> list[list[Cell]]:
+        """Views of all cells, row by row."""
+        return [
+            [Cell(x_pos, y_pos, self) for x_pos in range(self.dimensions.width)]
+            for y_pos in range(self.dimensions.height)
+        ]
+
+    def fits_terminal(self) -> bool:
+        """
+        Check if at least one cell of the grid fits into the terminal.
+
+        A warning is printed in the middle of the terminal if it doesn't.
+        """
+        warning_position = boxed.terminal.move_xy(boxed.terminal.width // 2 - 18, boxed.terminal.height // 2)
+        visible = visible_dimensions(self.dimensions)
+        if not visible.width:
+            write(warning_position, "Your terminal's width is too small!")
             return False
 
-        elif self.dimensions.char_height > boxed.terminal.height - 2:
-            print("Your terminal's height is too small!")
+        elif not visible.height:
+            write(warning_position, "Your terminal's height is too small!")
+            return False
+
+        return True
+
+    def print_grid(self) -> bool:
+        """
+        Print all cells visible in the viewport in a centered grid.
+
+        Return True if the grid was displayed, False otherwise.
+        """
+        if not self.fits_terminal():
             return False
 
         lines = []
-        x, y = grid_center_offset_coords(self.dimensions)
-        for row, cells in enumerate(self.cells):
+        x, y = self.viewport.cell_start(self.viewport.left, self.viewport.top)
+        move_left = sequences.move_left()
+        if self.viewport.shows_all() and raster.should_rasterize(self):
+            # The same lines as below, built for the whole board at once
+            for line_index, line in enumerate(raster.board_lines(self, move_left)):
+                row, line_pos = divmod(line_index, self.dimensions.cell_size + 2)
+                lines.append(sequences.move_xy(x, y + line_pos + row * (self.dimensions.cell_size + 1)) + line)
+            write(*lines)
+            return True
+
+        columns, rows = self.viewport.visible_ranges()
+        for row, y_pos in enumerate(rows):
             for line_pos, iterables in enumerate(
-                zip(*(cell.generate_cell_lines() for cell in cells))
+                zip(*(Cell(x_pos, y_pos, self).generate_cell_lines() for x_pos in columns))
             ):
                 lines.append(
                     # Move cursor to start of line.
-                    boxed.terminal.move_xy(
+                    sequences.move_xy(
                         x, y + line_pos + row * (self.dimensions.cell_size + 1)
                     )
                     # After every cell, move one character left to overlap edges.
-                    + boxed.terminal.move_left.join(iterables)
+                    + move_left.join(iterables)
                 )
-        print("\n".join(lines))
+        write(*lines)
         return True
 
+    def cell(self, index: int) -> Cell:
+        """Get the cell at `index`."""
+        y_pos, x_pos = divmod(index, self.dimensions.width)
+        return Cell(x_pos, y_pos, self)
+
     def cell_at(self, x: int, y: int) -> typing.Optional[Cell]:
         """Get call at `x` and `y`, or None if the cell is out of bounds."""
         if 0 <= x < self.dimensions.width and 0 <= y < self.dimensions.height:
-            return self.cells[y][x]
+            return Cell(x, y, self)
         else:
             return None
 
@@ -329,47 +479,129 @@ class Grid:
         self, start_cell: Cell, direction: Direction
     ) -> typing.Optional[Cell]:
         """Get cell in `direction` from `start_cell`, or None if the cell is at an edge."""
-        if direction is Direction.UP:
-            return self.cell_at(start_cell.x_pos, start_cell.y_pos - 1)
-        elif direction is Direction.DOWN:
-            return self.cell_at(start_cell.x_pos, start_cell.y_pos + 1)
-        elif direction is Direction.LEFT:
-            return self.cell_at(start_cell.x_pos - 1, start_cell.y_pos)
-        elif direction is Direction.RIGHT:
-            return self.cell_at(start_cell.x_pos + 1, start_cell.y_pos)
+        index = self.neighbours[direction][start_cell.index]
+        if index == -1:
+            return None
+        return self.cell(index)
+
+    def neighbour_index(self, index: int, direction: Direction) -> int:
+        """Get the index of the cell in `direction` from the cell at `index`, or -1 if the cell is at an edge."""
+        return self.neighbours[direction][index]
+
+    def corners(self, index: int) -> tuple[WBorder, WBorder, WBorder, WBorder]:
+        """Get the corner borders of the cell at `index`, which depend on the edges of the grid it's on."""
+        y_pos, x_pos = divmod(index, self.dimensions.width)
+        return CORNERS[_edge_class(y_pos, self.dimensions.height)][_edge_class(x_pos, self.dimensions.width)]
+
+    def edge_center(self, index: int, direction: Direction) -> WBorder:
+        """Get the center piece of the edge in `direction` of the cell at `index`."""
+        neighbour = self.neighbours[direction][index]
+        key = self.states[index] >> direction & 1
+        if neighbour != -1:
+            key |= (self.states[neighbour] >> (direction ^ 2) & 1) << 1 | 0b100
+        return EDGE_CENTERS[direction][key]
+
+    def connected(self, index: int, direction: Direction) -> bool:
+        """Check if the cell at `index` has a full connection with its neighbour in `direction`."""
+        neighbour = self.neighbours[direction][index]
+        if neighbour == -1:
+            return False
+        return bool(self.states[index] >> direction & 1 and self.states[neighbour] >> (direction ^ 2) & 1)
 
     def cells_connected(self, cell1: Cell, cell2: Cell) -> bool:
         """Check if there is a full connection between `cell1` and `cell2`."""
         direction = self.get_direction_between(cell1, cell2)
-        if direction is Direction.UP:
-            return Direction.UP in cell1.openings and Direction.DOWN in cell2.openings
-        elif direction is Direction.DOWN:
-            return Direction.DOWN in cell1.openings and Direction.UP in cell2.openings
-        elif direction is Direction.LEFT:
-            return (
-                Direction.LEFT in cell1.openings and Direction.RIGHT in cell2.openings
-            )
-        else:
-            return (
-                Direction.RIGHT in cell1.openings and Direction.LEFT in cell2.openings
-            )
+        return bool(self.states[cell1.index] >> direction & 1 and self.states[cell2.index] >> (direction ^ 2) & 1)
 
     def create_cell_opening(self, cell1: Cell, cell2: Cell) -> None:
         """Create an opening between two adjacent cells, on edges of both cells."""
         direction = self.get_direction_between(cell1, cell2)
-        if direction is Direction.RIGHT:
-            cell1.openings.reverse_opening(Direction.RIGHT)
-            cell2.openings.reverse_opening(Direction.LEFT)
-        elif direction is Direction.LEFT:
-            cell1.openings.reverse_opening(Direction.LEFT)
-            cell2.openings.reverse_opening(Direction.RIGHT)
-
-        elif direction is Direction.DOWN:
-            cell1.openings.reverse_opening(Direction.DOWN)
-            cell2.openings.reverse_opening(Direction.UP)
-        else:
-            cell1.openings.reverse_opening(Direction.UP)
-            cell2.openings.reverse_opening(Direction.DOWN)
+        self.reverse_opening(cell1.index, direction)
+        self.reverse_opening(cell2.index, direction.opposite())
+
+    def reverse_opening(self, index: int, opening: Direction) -> None:
+        """Reverse the current state of `opening` on the cell at `index`."""
+        self.states[index] ^= 1 << opening
+        self._notify(index)
+
+    def reset_openings(self, index: int) -> None:
+        """Reset all openings of the cell at `index` to the closed state."""
+        if self.states[index] & OPENINGS_MASK:
+            self.states[index] &= ~OPENINGS_MASK
+            self._notify(index)
+
+    def rotate(self, index: int, n: int = 1) -> None:
+        """Rotate the openings of the cell at `index` by `n` rotations clockwise, if it's rotatable."""
+        state = self.states[index]
+        if state & ROTATABLE_FLAG:
+            rotated = (state & ~OPENINGS_MASK) | ROTATED_MASKS[n % 4][state & OPENINGS_MASK]
+            if rotated != state:
+                self.states[index] = rotated
+                self._notify(index)
+
+    def clear(self) -> None:
+        """
+        Reset all cells to rotatable cells without any openings.
+
+        Observers are not notified of the change.
+        """
+        self.states[:] = bytes((ROTATABLE_FLAG,)) * len(self.states)
+
+    def packed_openings(self) -> bytes:
+        """Get the openings of all cells packed two cells per byte, the first cell of a pair in the low bits."""
+        states = self.states
+        packed = bytearray((len(states) + 1) // 2)
+        for index in range(0, len(states) - 1, 2):
+            packed[index // 2] = (states[index] & OPENINGS_MASK) | (states[index + 1] & OPENINGS_MASK) << 4
+        if len(states) % 2:
+            packed[-1] = states[-1] & OPENINGS_MASK
+        return bytes(packed)
+
+    def load_packed_openings(self, packed: bytes) -> None:
+        """
+        Set the openings of all cells from `packed`, in the format created by `packed_openings`.
+
+        Flags of the cells are kept and observers are not notified of the change.
+        """
+        states = self.states
+        openings = bytearray(len(states))
+        openings[0::2] = packed.translate(_LOW_OPENINGS)[:(len(states) + 1) // 2]
+        openings[1::2] = packed.translate(_HIGH_OPENINGS)[:len(states) // 2]
+        flags = bytes((~OPENINGS_MASK & 0xFF,)) * len(states)
+        # The cells are combined as one large integer, which is much faster than a loop over them
+        combined = (
+            int.from_bytes(states, "little") & int.from_bytes(flags, "little") | int.from_bytes(openings, "little")
+        )
+        states[:] = combined.to_bytes(len(states), "little")
+
+    def rotations_since(self, packed: bytes) -> bytes:
+        """
+        Get how many times every cell was rotated clockwise since the openings were `packed` by `packed_openings`.
+
+        The rotations are packed four cells per byte, the first cell in the lowest two bits.
+        """
+        states = self.states
+        rotations = bytearray((len(states) + 3) // 4)
+        for index, state in enumerate(states):
+            initial = packed[index // 2] >> (index % 2 * 4) & OPENINGS_MASK
+            current = state & OPENINGS_MASK
+            if initial != current:
+                n = next((n for n in range(1, 4) if ROTATED_MASKS[n][initial] == current), 0)
+                rotations[index // 4] |= n << (index % 4 * 2)
+        return bytes(rotations)
+
+    def apply_rotations(self, rotations: bytes) -> None:
+        """Rotate every cell by its rotations in `rotations`, in the format created by `rotations_since`."""
+        for byte_index, packed in enumerate(rotations):
+            # Most cells usually weren't rotated, skip them four at a time
+            if packed:
+                for index in range(byte_index * 4, min(byte_index * 4 + 4, len(self.states))):
+                    if n := packed >> (index % 4 * 2) & 0b11:
+                        self.rotate(index, n)
+
+    def _notify(self, index: int) -> None:
+        for observer in self.observers:
+            observer(index)
 
     @staticmethod
     def get_direction_between(cell1: Cell, cell2: Cell) -> Direction:
@@ -390,7 +622,85 @@ class Grid:
         """Get the manhattan distance between two cells."""
         return abs(cell1.x_pos - cell2.x_pos) + abs(cell1.y_pos - cell2.y_pos)
 
+    def __iter__(self) -> collections.abc.Iterator[Cell]:
+        return (self.cell(index) for index in range(len(self.states)))
+
+    def __len__(self):
+        return len(self.states)
+
+
+@functools.lru_cache(maxsize=4096)
+def cell_lines(
+    size: int,
+    corners: tuple[WBorder, WBorder, WBorder, WBorder],
+    edge_centers: tuple[WBorder, WBorder, WBorder, WBorder],
+) -> tuple[str, ...]:
+    """
+    Create the lines of a cell with `size`, `corners` and the centers of its edges in `edge_centers`.
+
+    `edge_centers` is indexed by `Direction`. Cells only differ in these, so the lines are cached;
+    hits and misses can be inspected through `cell_lines.cache_info()`.
+    """
+    top_left, top_right, bottom_left, bottom_right = corners
+    modifier_size = size * WIDTH_MULTIPLIER
+    side_line = "".join((WBorder.VERTICAL, " " * modifier_size, WBorder.VERTICAL))
+
+    lines = [
+        "".join(
+            (
+                top_left,
+                WBorder.HORIZONTAL * (modifier_size // 2 - (1 - modifier_size % 2)),
+                edge_centers[Direction.UP],
+                WBorder.HORIZONTAL * (modifier_size // 2),
+                top_right,
+            )
+        )
+    ]
+    lines.extend(side_line for _ in range(size // 2 - (1 - modifier_size % 2)))
+    lines.append(
+        "".join(
+            (
+                edge_centers[Direction.LEFT],
+                " " * modifier_size,
+                edge_centers[Direction.RIGHT],
+            )
+        )
+    )
+    lines.extend(side_line for _ in range(size // 2))
+    lines.append(
+        "".join(
+            (
+                bottom_left,
+                WBorder.HORIZONTAL * (modifier_size // 2 - (1 - modifier_size % 2)),
+                edge_centers[Direction.DOWN],
+                WBorder.HORIZONTAL * (modifier_size // 2),
+                bottom_right,
+            )
+        )
+    )
+    return tuple(lines)
+
+
+@layout_cache
+def visible_dimensions(grid_dimensions: GridDimensions) -> GridDimensions:
+    """Get the dimensions of the part of a grid with `grid_dimensions` which fits into the terminal."""
+    columns = (boxed.terminal.width - 3) // (grid_dimensions.cell_size * WIDTH_MULTIPLIER + 1)
+    rows = (boxed.terminal.height - 3) // (grid_dimensions.cell_size + 1)
+    return GridDimensions(
+        grid_dimensions.cell_size,
+        max(min(columns, grid_dimensions.width), 0),
+        max(min(rows, grid_dimensions.height), 0),
+    )
+
+
+def _scroll_position(start: int, position: int, visible: int, total: int) -> int:
+    """Get the first of `visible` out of `total` positions, moved from `start` so `position` is visible."""
+    if not start <= position < start + visible:
+        start = position - visible // 2
+    return max(min(start, total - visible), 0)
+
 
+@layout_cache
 def grid_center_offset_coords(grid_dimensions: GridDimensions) -> tuple[int, int]:
     """Get coordinates of the top left corner of a centered grid with `grid_dimensions`."""
     x = boxed.terminal.width // 2 - grid_dimensions.char_width // 2
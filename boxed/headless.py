@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import io
+import typing
+
+import blessed
+from blessed.keyboard import Keystroke
+from blessed.terminal import WINSZ
+
+
+class KeysExhausted(Exception):
+    """Raised by `App` when a screen waits for a key after all scripted keys of a `HeadlessTerminal` were read."""
+
+
+class CaptureStream(io.StringIO):
+    """A stream which keeps what's written to it and counts the written bytes and the calls to `write`."""
+
+    def __init__(self):
+        super().__init__()
+        self.bytes_written = 0
+        self.writes = 0
+
+    def write(self, text: str) -> int:  # noqa: D102
+        self.bytes_written += len(text.encode())
+        self.writes += 1
+        return super().write(text)
+
+    def reset(self) -> None:
+        """Forget everything written so far."""
+        self.seek(0)
+        self.truncate()
+        self.bytes_written = 0
+        self.writes = 0
+
+
+class HeadlessTerminal(blessed.Terminal):
+    """
+    A terminal kept in memory, used in place of a real one as `boxed.terminal`.
+
+    It has a `width` and `height` which only change through `resize`, everything written to it
+    is captured by the `CaptureStream` in `stream`, and its keys are scripted with `press`.
+    Reading a key never blocks, an empty keystroke is read once the scripted keys ran out.
+    """
+
+    def __init__(self, width: int = 80, height: int = 24):
+        super().__init__(kind="xterm-256color", stream=CaptureStream(), force_styling=True)
+        self._size = WINSZ(ws_row=height, ws_col=width, ws_xpixel=0, ws_ypixel=0)
+
+    def resize(self, width: int, height: int) -> None:
+        """Change the size of the terminal."""
+        self._size = WINSZ(ws_row=height, ws_col=width, ws_xpixel=0, ws_ypixel=0)
+
+    def press(self, *keys: str) -> None:
+        """
+        Queue `keys` to be read after the keys queued before them.
+
+        Keys are given as the text the terminal would send, like "s", "\\r" or "\\x1b[A" for the up key.
+        """
+        self.ungetch("".join(keys))
+
+    def inkey(
+        self, timeout: typing.Optional[float] = None, esc_delay: float = 0.35, capture_cpr: bool = False
+    ) -> Keystroke:
+        """Read the next scripted key, or an empty keystroke if there are none left."""
+        return super().inkey(timeout=0, esc_delay=esc_delay, capture_cpr=capture_cpr)
+
+    def _height_and_width(self) -> WINSZ:
+        return self._size
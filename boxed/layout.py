@@ -0,0 +1,23 @@
+import functools
+import typing
+
+_caches = []
+
+_Function = typing.TypeVar("_Function", bound=typing.Callable)
+
+
+def layout_cache(function: _Function) -> _Function:
+    """
+    Cache the results of `function`, which depend on the terminal or its size, until `invalidate` is called.
+
+    The arguments of `function` have to be hashable.
+    """
+    cached = functools.lru_cache(maxsize=None)(function)
+    _caches.append(cached)
+    return cached
+
+
+def invalidate() -> None:
+    """Forget all cached layouts, called once the terminal settles on a new size or is replaced."""
+    for cache in _caches:
+        cache.cache_clear()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import collections
+import collections.abc
+import contextlib
+import math
+import time
+import typing
+
+# Amount of the most recent samples kept for every metric
+HISTORY_LENGTH = 256
+SPARK_CHARACTERS = "▁▂▃▄▅▆▇█"
+
+_samples: dict[str, collections.deque[float]] = {}
+
+
+def record(name: str, value: float) -> None:
+    """Record a sample of the metric `name`, dropping its oldest sample if the history is full."""
+    samples = _samples.get(name)
+    if samples is None:
+        samples = _samples[name] = collections.deque(maxlen=HISTORY_LENGTH)
+    samples.append(value)
+
+
+@contextlib.contextmanager
+def timed(name: str) -> typing.Iterator[None]:
+    """Record the time the context took in seconds as a sample of the metric `name`."""
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start_time)
+
+
+def last(name: str) -> float:
+    """Get the latest sample of the metric `name`, or 0 if it wasn't recorded yet."""
+    samples = _samples.get(name)
+    return samples[-1] if samples else 0
+
+
+def metric_percentile(name: str, percent: float) -> float:
+    """Get the `percent` percentile of the recorded samples of the metric `name`."""
+    return percentile(_samples.get(name, ()), percent)
+
+
+def sparkline(name: str, width: int) -> str:
+    """Draw the last `width` samples of the metric `name` as a line of bars scaled to the largest of them."""
+    samples = list(_samples.get(name, ()))[-width:]
+    highest = max(samples, default=0)
+    if not highest:
+        return SPARK_CHARACTERS[0] * len(samples)
+    scale = (len(SPARK_CHARACTERS) - 1) / highest
+    return "".join(SPARK_CHARACTERS[round(sample * scale)] for sample in samples)
+
+
+def clear() -> None:
+    """Forget the samples of all metrics."""
+    _samples.clear()
+
+
+def percentile(values: collections.abc.Collection[float], percent: float) -> float:
+    """Get the `percent` percentile of `values` using the nearest rank, or 0 if there are no values."""
+    if not values:
+        return 0
+    ordered = sorted(values)
+    return ordered[max(math.ceil(percent / 100 * len(ordered)) - 1, 0)]
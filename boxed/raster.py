@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import importlib.util
+import typing
+
+from boxed import grid
+from boxed.constants import WBorder
+
+if typing.TYPE_CHECKING:
+    import numpy
+
+# numpy is only imported once a board is rasterized, as importing it takes longer than starting the rest of the game
+_NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+# Grids with fewer cells are drawn cell by cell, as the setup of the arrays costs more than it saves
+MIN_RASTER_CELLS = 100
+# Placeholder between cells in board lines, replaced by the cursor movement overlapping their edges
+_SEPARATOR = "\ue000"
+
+
+def available() -> bool:
+    """Check if numpy is installed and boards can be rasterized."""
+    return _NUMPY_AVAILABLE
+
+
+def should_rasterize(board: grid.Grid) -> bool:
+    """Check if `board` is drawn faster by rasterizing it than cell by cell."""
+    return _NUMPY_AVAILABLE and len(board) >= MIN_RASTER_CELLS
+
+
+def cell_line_array(board: grid.Grid) -> numpy.ndarray:
+    """
+    Create the lines of all cells of `board` at once.
+
+    The array is indexed by the row of the cell, the line in the cell and the column of the cell,
+    and its elements are the same strings as in `Cell.generate_cell_lines`.
+    """
+    import numpy
+
+    codepoints = _cell_codepoints(board)
+    height, line_count, width, line_length = codepoints.shape
+    return numpy.ascontiguousarray(codepoints).view(f"<U{line_length}").reshape(height, line_count, width)
+
+
+def cell_lines_by_index(board: grid.Grid) -> list[tuple[str, ...]]:
+    """Create the lines of all cells of `board`, indexed by the index of the cell."""
+    lines = cell_line_array(board).transpose(0, 2, 1).reshape(len(board), -1)
+    return [tuple(cell_lines) for cell_lines in lines.tolist()]
+
+
+def board_lines(board: grid.Grid, move_left: str) -> list[str]:
+    """
+    Create the lines `Grid.print_grid` draws for every line of every row of cells.
+
+    The lines of neighbouring cells are joined with `move_left`, so their shared edge is drawn over.
+    """
+    import numpy
+
+    codepoints = _cell_codepoints(board)
+    height, line_count, width, line_length = codepoints.shape
+    separated = numpy.full((height, line_count, width, line_length + 1), ord(_SEPARATOR), dtype="<u4")
+    separated[..., :-1] = codepoints
+    rows = separated.reshape(height * line_count, width * (line_length + 1))[:, :-1]
+    lines = numpy.ascontiguousarray(rows).view(f"<U{rows.shape[1]}").ravel().tolist()
+    return [line.replace(_SEPARATOR, move_left) for line in lines]
+
+
+def _cell_codepoints(board: grid.Grid) -> numpy.ndarray:
+    """
+    Create the codepoints of all cells of `board` in an array indexed like `cell_line_array`.
+
+    The layout of a cell follows `grid.cell_lines`.
+    """
+    import numpy
+
+    dimensions = board.dimensions
+    size, width, height = dimensions.cell_size, dimensions.width, dimensions.height
+    modifier_size = size * grid.WIDTH_MULTIPLIER
+    center_column = 1 + modifier_size // 2 - (1 - modifier_size % 2)
+    center_line = 1 + size // 2 - (1 - modifier_size % 2)
+
+    states = numpy.frombuffer(board.states, dtype=numpy.uint8).reshape(height, width)
+    openings = [states >> direction & 1 for direction in grid.Direction]
+
+    cells = numpy.full((height, size + 2, width, modifier_size + 2), ord(" "), dtype="<u4")
+    cells[:, [0, -1], :, 1:-1] = ord(WBorder.HORIZONTAL)
+    cells[:, 1:-1, :, [0, -1]] = ord(WBorder.VERTICAL)
+
+    corners = numpy.array(
+        [[[ord(corner) for corner in cell] for cell in row] for row in grid.CORNERS], dtype="<u4"
+    )
+    row_classes = numpy.ones(height, dtype=numpy.intp)
+    row_classes[-1], row_classes[0] = 2, 0
+    column_classes = numpy.ones(width, dtype=numpy.intp)
+    column_classes[-1], column_classes[0] = 2, 0
+    cell_corners = corners[row_classes[:, None], column_classes[None, :]]
+    cells[:, 0, :, 0] = cell_corners[..., 0]
+    cells[:, 0, :, -1] = cell_corners[..., 1]
+    cells[:, -1, :, 0] = cell_corners[..., 2]
+    cells[:, -1, :, -1] = cell_corners[..., 3]
+
+    edge_positions = {
+        grid.Direction.UP: (0, center_column),
+        grid.Direction.RIGHT: (center_line, -1),
+        grid.Direction.DOWN: (-1, center_column),
+        grid.Direction.LEFT: (center_line, 0),
+    }
+    for direction, (line, column) in edge_positions.items():
+        neighbour_open = numpy.zeros((height, width), dtype=numpy.uint8)
+        neighbour_exists = numpy.zeros((height, width), dtype=numpy.uint8)
+        opposite_openings = openings[direction ^ 2]
+        if direction is grid.Direction.UP:
+            neighbour_open[1:], neighbour_exists[1:] = opposite_openings[:-1], 1
+        elif direction is grid.Direction.DOWN:
+            neighbour_open[:-1], neighbour_exists[:-1] = opposite_openings[1:], 1
+        elif direction is grid.Direction.LEFT:
+            neighbour_open[:, 1:], neighbour_exists[:, 1:] = opposite_openings[:, :-1], 1
+        else:
+            neighbour_open[:, :-1], neighbour_exists[:, :-1] = opposite_openings[:, 1:], 1
+        keys = openings[direction] | neighbour_open << 1 | neighbour_exists << 2
+        glyphs = numpy.array([ord(glyph) for glyph in grid.EDGE_CENTERS[direction]], dtype="<u4")
+        cells[:, line, :, column] = glyphs[keys]
+    return cells
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import argparse
+import collections.abc
+import datetime
+import itertools
+import json
+import os
+import struct
+import time
+import typing
+from pathlib import Path
+
+from blessed.keyboard import Keystroke
+
+import boxed
+from boxed import layout, session
+from boxed.frame import frame
+from boxed.headless import HeadlessTerminal
+from boxed.metrics import percentile
+from boxed.screens import game
+
+FILE_HEADER = struct.Struct("<4sB")
+FILE_MAGIC = b"BXRC"
+FILE_VERSION = 1
+# terminal width, terminal height, length of the session the recording starts from
+RECORDING_HEADER = struct.Struct("<HHI")
+# seconds since the recording started, length of the key's text, length of the key's name
+KEY_HEADER = struct.Struct("<dBB")
+
+
+class RecordingError(Exception):
+    """Raised when a recording can't be read."""
+
+
+class Recording(typing.NamedTuple):
+    """
+    The keys pressed in a game and the state the game started in.
+
+    `session` is the game's session encoded by `session.encode_session` when the recording started,
+    `keys` are the times the keys were pressed at, in seconds since the start, and the keys.
+    """
+
+    terminal_width: int
+    terminal_height: int
+    session: bytes
+    keys: list[tuple[float, Keystroke]]
+
+    def encode(self) -> bytes:
+        """
+        Encode the recording.
+
+        The recording is stored as a `RECORDING_HEADER`, the session, and every key as a `KEY_HEADER`
+        followed by its text and name in UTF-8.
+        """
+        data = [
+            FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION),
+            RECORDING_HEADER.pack(self.terminal_width, self.terminal_height, len(self.session)),
+            self.session,
+        ]
+        for timestamp, key in self.keys:
+            text, name = str(key).encode(), (key.name or "").encode()
+            data.append(KEY_HEADER.pack(timestamp, len(text), len(name)) + text + name)
+        return b"".join(data)
+
+    @classmethod
+    def decode(cls, data: bytes) -> Recording:
+        """Decode the recording encoded by `encode`."""
+        try:
+            magic, version = FILE_HEADER.unpack_from(data)
+            if magic != FILE_MAGIC:
+                raise RecordingError("not a recording")
+            if version != FILE_VERSION:
+                raise RecordingError(f"recorded by an unsupported version {version}")
+            offset = FILE_HEADER.size
+            width, height, session_length = RECORDING_HEADER.unpack_from(data, offset)
+            offset += RECORDING_HEADER.size
+            recorded_session = bytes(data[offset:offset + session_length])
+            offset += session_length
+
+            keys = []
+            while offset < len(data):
+                timestamp, text_length, name_length = KEY_HEADER.unpack_from(data, offset)
+                offset += KEY_HEADER.size
+                text = bytes(data[offset:offset + text_length]).decode()
+                offset += text_length
+                name = bytes(data[offset:offset + name_length]).decode()
+                offset += name_length
+                keys.append((timestamp, Keystroke(text, name=name or None)))
+        except (struct.error, UnicodeDecodeError) as error:
+            raise RecordingError(f"damaged recording: {error}") from error
+        return cls(width, height, recorded_session, keys)
+
+
+class Recorder:
+    """Record the keys pressed in the game of `game_tracker`, starting from its current state."""
+
+    def __init__(self, game_tracker: game.GameTracker):
+        self.terminal_size = boxed.terminal.width, boxed.terminal.height
+        self.session = session.encode_session(game_tracker)
+        self.keys: list[tuple[float, Keystroke]] = []
+        self._start_time = time.perf_counter()
+
+    def record(self, key: Keystroke) -> None:
+        """Record that `key` was pressed now."""
+        self.keys.append((time.perf_counter() - self._start_time, key))
+
+    def recording(self) -> Recording:
+        """Get everything recorded so far."""
+        return Recording(*self.terminal_size, self.session, list(self.keys))
+
+
+def recording_directory() -> typing.Optional[Path]:
+    """Get the directory games are recorded to, set by the BOXED_RECORD environment variable."""
+    directory = os.environ.get("BOXED_RECORD")
+    return Path(directory) if directory else None
+
+
+def save_recording(recorder: Recorder, directory: Path) -> Path:
+    """
+    Save what `recorder` recorded into `directory`, named by the time it's saved at, and return its path.
+
+    Existing recordings are never overwritten, a number is added to the name if it's already taken.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    name = datetime.datetime.now().strftime("game-%Y%m%d-%H%M%S-%f")
+    data = recorder.recording().encode()
+    for attempt in itertools.count():
+        path = directory / (f"{name}-{attempt}.bxr" if attempt else f"{name}.bxr")
+        try:
+            with open(path, "xb") as file:
+                file.write(data)
+        except FileExistsError:
+            continue
+        return path
+
+
+class _ReplayApp:
+    """Stand in for the `App` of a replayed screen, keeping the result it finishes with."""
+
+    def __init__(self):
+        self.finished = False
+        self.result = None
+
+    def finish(self, result: object = None) -> None:
+        """Note that the screen finished with `result`."""
+        if not self.finished:
+            self.finished = True
+            self.result = result
+
+
+def replay(
+    recording: Recording, terminal_size: typing.Optional[tuple[int, int]] = None
+) -> dict[str, typing.Any]:
+    """
+    Replay `recording` through a `GameScreen` as fast as possible against a headless terminal.
+
+    The terminal has the recorded size unless `terminal_size` is given.
+    Every key is handled in its own frame like in `App`, the time it took and the bytes it wrote are reported.
+    """
+    boxed.terminal = HeadlessTerminal(*(terminal_size or (recording.terminal_width, recording.terminal_height)))
+    layout.invalidate()
+    stream = boxed.terminal.stream
+    game_tracker = session.decode_session(memoryview(recording.session))
+    game_tracker.prefetch_children()
+    screen = game.GameScreen(game_tracker)
+    screen.app = app = _ReplayApp()
+
+    start_time = time.perf_counter()
+    with frame():
+        screen.draw()
+    latencies = []
+    for _, key in recording.keys:
+        if app.finished:
+            break
+        key_start_time = time.perf_counter()
+        with frame():
+            screen.on_key(key)
+        latencies.append(time.perf_counter() - key_start_time)
+    total_time = time.perf_counter() - start_time
+
+    return {
+        "keys": len(latencies),
+        "recorded_time": recording.keys[-1][0] if recording.keys else 0,
+        "total_time": total_time,
+        "p50_key_latency": percentile(latencies, 50) if latencies else 0,
+        "p90_key_latency": percentile(latencies, 90) if latencies else 0,
+        "p99_key_latency": percentile(latencies, 99) if latencies else 0,
+        "max_key_latency": max(latencies, default=0),
+        "output_bytes": stream.bytes_written,
+        "output_writes": stream.writes,
+        "result": {None: "unfinished", False: "exited", True: "won"}[app.result],
+    }
+
+
+def parse_size(size: str) -> tuple[int, int]:
+    """Parse a terminal size in the WIDTHxHEIGHT format."""
+    try:
+        width, height = (int(part) for part in size.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid size {size!r}, expected WIDTHxHEIGHT.")
+    return width, height
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create the parser of the replay command's arguments."""
+    parser = argparse.ArgumentParser(
+        prog="python -m boxed replay", description="Replay recorded games without a terminal and time them."
+    )
+    parser.add_argument("recordings", nargs="+", type=Path, help="recordings saved with BOXED_RECORD")
+    parser.add_argument(
+        "--terminal-size", type=parse_size, help="size of the terminal as WIDTHxHEIGHT (default: the recorded size)"
+    )
+    parser.add_argument("--output", help="file the results are saved to as JSON")
+    return parser
+
+
+def main(arguments: collections.abc.Sequence[str]) -> int:
+    """Run the replay command with command line `arguments`."""
+    options = create_parser().parse_args(arguments)
+    # Replayed keys play sounds, which would only add noise to the measured latencies
+    os.environ.setdefault("BOXED_AUDIO", "0")
+    results = []
+    for path in options.recordings:
+        try:
+            recording = Recording.decode(path.read_bytes())
+            result = {"recording": str(path), **replay(recording, options.terminal_size)}
+        except (OSError, RecordingError, session.SessionError) as error:
+            print(f"{path}: {error}")
+            return 1
+        results.append(result)
+        print(
+            f"{path}: {result['keys']} keys ({result['result']}) in {result['total_time'] * 1000:.2f}ms, "
+            f"recorded over {result['recorded_time']:.1f}s, {result['output_bytes']}B written\n"
+            f"  key latency p50 {result['p50_key_latency'] * 1000:.3f}ms, "
+            f"p90 {result['p90_key_latency'] * 1000:.3f}ms, p99 {result['p99_key_latency'] * 1000:.3f}ms, "
+            f"max {result['max_key_latency'] * 1000:.3f}ms"
+        )
+
+    if options.output:
+        with open(options.output, "w") as file:
+            json.dump(results, file, indent=2)
+    return 0
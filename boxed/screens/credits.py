@@ -1,18 +1,20 @@
-from threading import Thread
 
-from playsound import playsound
+from blessed.keyboard import Keystroke
 
 import boxed
+from boxed import sound
+from boxed.app import App, Screen
 from boxed.border import draw_boundary
+from boxed.frame import write
 
 
 def print_authors(authors: dict[str, str]) -> None:
     """Prints a list of authors with links from a dictionary of authors and links."""
-    print(boxed.terminal.move_y(boxed.terminal.height // 2 - len(authors) // 2), end="")
+    write(boxed.terminal.move_y(boxed.terminal.height // 2 - len(authors) // 2))
 
     for author in authors:
-        print(boxed.terminal.move_right(2), end="")
-        print(
+        write(boxed.terminal.move_right(2))
+        write(
             boxed.terminal.link(
                 authors[author],
                 boxed.terminal.white_bold
@@ -20,47 +22,40 @@ def print_authors(authors: dict[str, str]) -> None:
                 + boxed.terminal.normal
                 + " - "
                 + authors[author],
-            )
+            ),
+            "\n",
         )  # Not all terminals support links so it also prints the url next to the author
 
-    print(
+    write(
         boxed.terminal.move(boxed.terminal.height - 3, boxed.terminal.width - 20)
         + f"Press {boxed.terminal.white_bold}B{boxed.terminal.normal} to go back"
     )
     draw_boundary()
 
 
-def show_credits(authors: dict[str, str]) -> None:
+class CreditsScreen(Screen):
     """
     Displays a list of authors who contributed to this project.
 
     Args:
         authors (dict): A dictionary containing the author and their github page url
     """
-    with boxed.terminal.fullscreen() and boxed.terminal.hidden_cursor():
-        print(boxed.terminal.clear)
-        print_authors(authors)
 
-        terminal_size = boxed.terminal.width, boxed.terminal.height
+    def __init__(self, authors: dict[str, str]):
+        self.authors = authors
 
-        while True:
-            with boxed.terminal.cbreak():
-                key = boxed.terminal.inkey(timeout=0.1)
+    def draw(self) -> None:
+        """Draw the authors."""
+        write(boxed.terminal.clear)
+        print_authors(self.authors)
 
-                # Resize border if the terminal size gets changed
-                if (boxed.terminal.width, boxed.terminal.height) != terminal_size:
-                    print(boxed.terminal.clear)
-                    print_authors(authors)
-                    draw_boundary()
-                    terminal_size = boxed.terminal.width, boxed.terminal.height
+    def on_key(self, key: Keystroke) -> None:
+        """Go back when B is pressed."""
+        if key == "b":
+            sound.play("up-down")
+            self.finish()
 
-                if key == "b":
-                    Thread(
-                        target=lambda: playsound("music/up-down.wav"), daemon=True
-                    ).start()
-                    break
 
-
-def load_screen(authors: dict[str, str]) -> None:
+async def load_screen(app: App, authors: dict[str, str]) -> None:
     """Callback for loading a screen."""
-    show_credits(authors)
+    await app.show(CreditsScreen(authors))
@@ -1,204 +1,242 @@
 from __future__ import annotations
 
+import asyncio
 import collections.abc
+import concurrent.futures
+import math
 import random
+import time
 import typing
-from threading import Thread
 
 import more_itertools
-from playsound import playsound
+from blessed.keyboard import Keystroke
 
 import boxed
-from boxed import grid
+from boxed import grid, metrics, solver, sound
+from boxed.app import App, Screen
 from boxed.border import draw_boundary
+from boxed.connectivity import ConnectivityTracker
+from boxed.frame import frame, write
+from boxed.framebuffer import CellStyle, GridFrameBuffer
+from boxed.generation import (
+    GENERATORS, PathGenerator, SpanningTreeGenerator, derive_seed
+)
 
-KEY_OFFSETS = {
-    "KEY_DOWN": (0, 1),
-    "KEY_UP": (0, -1),
-    "KEY_LEFT": (-1, 0),
-    "KEY_RIGHT": (1, 0),
-}
+if typing.TYPE_CHECKING:
+    from boxed.recording import Recorder
 
-
-class PathGenerator:
-    """Generate and verify paths between points on `grid`."""
-
-    def __init__(self, grid: grid.Grid):
-        self.grid = grid
-        self.visited_cells = set()
-
-    def neighbours(self, cell: grid.Cell) -> collections.abc.Iterable[grid.Cell]:
-        """Get all neighbours around `cell`."""
-        for x_offset, y_offset in KEY_OFFSETS.values():
-            neighbour_cell = self.grid.cell_at(
-                cell.x_pos + x_offset, cell.y_pos + y_offset
-            )
-            if neighbour_cell is not None:
-                yield neighbour_cell
-
-    def generate_path(self, start: grid.Cell, end: grid.Cell) -> list[grid.Cell]:
-        """
-        Generate a random path between `start` and `end`.
-
-        Both start and end are included in the resulting path
-        """
-        visited_cells = {start}
-        path = [start]
-        current_cell = start
-        while current_cell != end:
-            valid_neighbours = tuple(
-                cell
-                for cell in self.neighbours(current_cell)
-                if cell not in visited_cells
-            )
-
-            if not valid_neighbours:
-                for current_cell in reversed(path.copy()):
-                    valid_neighbours = tuple(
-                        cell
-                        for cell in self.neighbours(current_cell)
-                        if cell not in visited_cells
-                    )
-                    if valid_neighbours:
-                        break
-                    else:
-                        path.pop()
-
-            current_cell = random.choice(valid_neighbours)
-            visited_cells.add(current_cell)
-            path.append(current_cell)
-        return path
-
-    def verify_path(self, start: grid.Cell, end: grid.Cell) -> bool:
-        """Valid path between start and end exists."""
-        visited_cells = {start}
-        path = [start]
-        current_cell = start
-        while current_cell != end:
-            valid_neighbours = tuple(
-                cell
-                for cell in self.neighbours(current_cell)
-                if cell not in visited_cells
-                and self.grid.cells_connected(cell, current_cell)
-            )
-            if not valid_neighbours:
-                for current_cell in reversed(path.copy()):
-                    valid_neighbours = tuple(
-                        cell
-                        for cell in self.neighbours(current_cell)
-                        if cell not in visited_cells
-                        and self.grid.cells_connected(cell, current_cell)
-                    )
-                    if valid_neighbours:
-                        break
-                    else:
-                        path.pop()
-                else:
-                    return False
-
-            current_cell = min(
-                valid_neighbours,
-                key=lambda c: self.grid.distance_between(c, current_cell),
-            )
-            visited_cells.add(current_cell)
-            path.append(current_cell)
-        return True
+# Generates games of recursive cells in the background
+_prefetch_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="boxed-prefetch")
+METRICS_OVERLAY_WIDTH = 24
 
 
 class Game:
-    """Hold control over a game on `grid`."""
+    """
+    Hold control over a game on `grid`.
+
+    `generator` is the name of the way the board is generated, one of `generation.GENERATORS`.
+    All random choices of the game are taken from `rng`, seeded with `seed`,
+    so the same seed always generates the same board. A random seed is picked if it's not given.
+    """
 
-    def __init__(self, grid: grid.Grid, rec_child_count: int):
+    def __init__(
+        self, grid: grid.Grid, rec_child_count: int, generator: str = "path", seed: typing.Optional[int] = None
+    ):
+        if generator not in GENERATORS:
+            raise ValueError(f"Unknown generator {generator!r}.")
         self.grid = grid
-        self._path_gen = PathGenerator(self.grid)
+        self.generator = generator
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.rng = random.Random(self.seed)
+        self._path_gen = PathGenerator(self.grid, self.rng)
+        self.connectivity = ConnectivityTracker(self.grid)
         self.path = None
+        self.path_attempts = 0
         self.start = None
         self.end = None
         self.recursive_cells = None
         self.current_selection = None
-        self._selection_colour = boxed.terminal.black_on_white
+        self._selection_colour = None
+        self._hint_shown = False
+        self._hint_cells: set[grid.Cell] = set()
+        self._hint_rotations: set[grid.Cell] = set()
+        self.framebuffer = GridFrameBuffer(self.grid, self.cell_style)
         self.recursive_child_count = rec_child_count
         self.path_completed = False
+        self.generation_time = 0
+        self.initial_openings = b""
 
     def start_game(self) -> None:
-        """Start the game by picking exit points, generating a valid path and randomizing other cells."""
-        for cell in more_itertools.flatten(self.grid.cells):
-            cell.openings.reset_openings()
-        self.start = self.grid.cell_at(0, random.randrange(self.grid.dimensions.height))
+        """
+        Start the game by picking exit points, generating a valid path and randomizing other cells.
+
+        The time the generation took is kept in `generation_time` and recorded as the generation metric.
+        """
+        start_time = time.perf_counter()
+        self.rng.seed(self.seed)
+        self.connectivity.detach()
+        if self._cell_changed in self.grid.observers:
+            self.grid.observers.remove(self._cell_changed)
+        self.grid.clear()
+        self.start = self.grid.cell_at(0, self.rng.randrange(self.grid.dimensions.height))
         self.end = self.grid.cell_at(
             self.grid.dimensions.width - 1,
-            random.randrange(self.grid.dimensions.height),
+            self.rng.randrange(self.grid.dimensions.height),
         )
         self.start.openings.rotatable = False
         self.end.openings.rotatable = False
         self.start.openings.reverse_opening(grid.Direction.LEFT)
         self.end.openings.reverse_opening(grid.Direction.RIGHT)
         self._generate_game()
+        self.connectivity.attach()
+        self.grid.observers.append(self._cell_changed)
         self.current_selection = self.grid.cell_at(0, 0)
-        self.recursive_cells = random.sample(
-            self.path[1:-1], min(self.recursive_child_count, 2, len(self.path))
+        self.recursive_cells = self.rng.sample(
+            self.path[1:-1], min(self.recursive_child_count, 2, len(self.path) - 2)
         )
-        self.recursive_cells.extend(
-            random.sample(
-                list(set(more_itertools.flatten(self.grid.cells)).difference(self.path)),
-                min(max(self.recursive_child_count - 2, 0), 0)
+        if off_path_count := min(max(self.recursive_child_count - 2, 0), 0):
+            path_cells = set(self.path)
+            self.recursive_cells.extend(
+                self.rng.sample(
+                    [cell for cell in self.grid if cell not in path_cells],
+                    off_path_count,
+                )
             )
-        )
+        for cell in self.recursive_cells:
+            cell.recursive = True
+        self.initial_openings = self.grid.packed_openings()
+        self.generation_time = time.perf_counter() - start_time
+        metrics.record("generation", self.generation_time)
+
+    def restore_game(
+        self,
+        start_index: int,
+        end_index: int,
+        path_indices: collections.abc.Iterable[int],
+        recursive_indices: collections.abc.Iterable[int],
+        initial_openings: bytes,
+        rotations: bytes,
+    ) -> None:
+        """
+        Restore a started game from its saved state instead of generating it.
+
+        The board is set to `initial_openings`, packed by `Grid.packed_openings`,
+        and its cells are rotated by `rotations` in the format of `Grid.rotations_since`.
+        """
+        self.connectivity.detach()
+        if self._cell_changed in self.grid.observers:
+            self.grid.observers.remove(self._cell_changed)
+        self.grid.clear()
+        self.start = self.grid.cell(start_index)
+        self.end = self.grid.cell(end_index)
+        self.start.openings.rotatable = False
+        self.end.openings.rotatable = False
+        self.grid.load_packed_openings(initial_openings)
+        self.initial_openings = bytes(initial_openings)
+        self.grid.apply_rotations(rotations)
+        self.path = [self.grid.cell(index) for index in path_indices]
+        self.recursive_cells = [self.grid.cell(index) for index in recursive_indices]
+        for cell in self.recursive_cells:
+            cell.recursive = True
+        # Labelling the components of a large board takes longer than the rest, it's done once it's first checked
+        self.connectivity.invalidate()
+        self.connectivity.attach()
+        self.grid.observers.append(self._cell_changed)
+        self.current_selection = self.grid.cell_at(0, 0)
 
     def move_selection(self, direction: grid.Direction) -> None:
-        """Move the current selection in `direction`"""
+        """Move the current selection in `direction`, scrolling the viewport to keep it visible."""
         if (
             target := self.grid.cell_in_direction(self.current_selection, direction)
         ) is not None:
-            self.current_selection.render()
+            self.framebuffer.invalidate(self.current_selection)
             self.current_selection = target
+            if self.grid.viewport.follow(target.x_pos, target.y_pos):
+                # Every visible cell moved, the viewport covers the same area so it's drawn over without clearing
+                self.framebuffer.reset()
             self.display_selection()
 
-    def display_generated_path(self) -> None:
-        """Display the stored valid path."""
-        for cell in self.path[1:]:
-            cell.render(boxed.terminal.black_on_white)
-        self.path[0].render(boxed.terminal.red_on_white)
-        self.path[-1].render(boxed.terminal.red_on_white)
+    def display_hint(self, fixed: collections.abc.Collection[int] = ()) -> None:
+        """
+        Display a path from the start to the end of the board in its current state until a cell is rotated.
+
+        The path is the one which takes the fewest rotations found by `solver.solve`, without rotating
+        the cells at the indices in `fixed`. The cells on it which still have to be rotated are highlighted
+        separately. The time taken is recorded as the hint metric.
+        """
+        with metrics.timed("hint"):
+            hint = solver.solve(self.grid, self.start.index, self.end.index, fixed=fixed)
+        self._hide_hint()
+        self._hint_shown = True
+        self._hint_cells = {self.grid.cell(index) for index in hint.path}
+        self._hint_rotations = {self.grid.cell(index) for index in hint.rotations}
+        self.framebuffer.invalidate(*self._hint_cells)
+        write(self.framebuffer.render())
+
+    def cell_style(self, cell: grid.Cell) -> CellStyle:
+        """Get the style `cell` is drawn with, with highlights for the selection, hint, exits and recursive cells."""
+        is_exit = cell == self.start or cell == self.end
+        if cell == self.current_selection:
+            if is_exit:
+                return 6, self._selection_colour or boxed.terminal.bold_red
+            elif cell.recursive:
+                return 6, boxed.terminal.bright_yellow
+            else:
+                return 6, self._selection_colour or boxed.terminal.bold_white
+        elif self._hint_shown and is_exit:
+            return 5, boxed.terminal.red_on_white
+        elif self._hint_shown and cell in self._hint_rotations:
+            return 4, boxed.terminal.black_on_cyan
+        elif self._hint_shown and cell in self._hint_cells:
+            return 3, boxed.terminal.black_on_white
+        elif is_exit:
+            return 2, boxed.terminal.red_on_black
+        elif cell.recursive:
+            return 1, boxed.terminal.yellow_on_black
+        else:
+            return 0, boxed.terminal.white_on_black
 
     def display(self, depth: int) -> None:
         """Display the whole grid and highlight exits and selection."""
-        print(boxed.terminal.clear, end="")
-        draw_boundary()
-        print(
-            boxed.terminal.move(boxed.terminal.height - 4, boxed.terminal.width - 26)
-            + f"Current depth: {depth}"
-            + boxed.terminal.move(boxed.terminal.height - 3, boxed.terminal.width - 26)
-            + f"Press {boxed.terminal.white_bold}S{boxed.terminal.normal} to stop the game"
-        )
-        if self.grid.print_grid():
-            self.path[0].render(boxed.terminal.red_on_black)
-            self.path[-1].render(boxed.terminal.red_on_black)
-            for cell in self.recursive_cells:
-                cell.render(boxed.terminal.yellow_on_black)
-            self.display_selection()
+        with frame():
+            write(boxed.terminal.clear)
+            draw_boundary()
+            write(
+                boxed.terminal.move(boxed.terminal.height - 4, boxed.terminal.width - 26)
+                + f"Current depth: {depth}"
+                + boxed.terminal.move(boxed.terminal.height - 3, boxed.terminal.width - 26)
+                + f"Press {boxed.terminal.white_bold}S{boxed.terminal.normal} to stop the game"
+            )
+            self._hint_shown = False
+            self.grid.viewport.follow(self.current_selection.x_pos, self.current_selection.y_pos)
+            if self.grid.fits_terminal():
+                self.framebuffer.reset()
+                write(self.framebuffer.render())
 
     def display_selection(
         self, colour: typing.Optional[typing.Callable] = None
     ) -> None:
-        """Display the current selection with `colour` or black on white."""
-        for cell in self.recursive_cells:
-            cell.render(boxed.terminal.yellow)
-        if self.current_selection is self.start or self.current_selection is self.end:
-            self.current_selection.render(colour or boxed.terminal.bold_red)
-        elif self.current_selection in self.recursive_cells:
-            self.current_selection.render(boxed.terminal.bright_yellow)
-        else:
-            self.start.render(boxed.terminal.red_on_black)
-            self.end.render(boxed.terminal.red_on_black)
-            self.current_selection.render(colour or boxed.terminal.bold_white)
+        """
+        Display the current selection with `colour` or its default highlight.
+
+        Only the cells which changed since the last frame are drawn.
+        """
+        self._selection_colour = colour
+        self.framebuffer.invalidate(self.current_selection)
+        write(self.framebuffer.render())
 
     def solved(self, *, cache: bool = True) -> bool:
-        """Verify if there's a valid paths between the ends"""
+        """
+        Verify if there's a valid paths between the ends
+
+        Outside of generation the connectivity tracker is kept up to date by the grid,
+        so this doesn't depend on the size of the grid. The time taken is recorded as the solved metric.
+        """
         if self.path_completed:
             return True
         else:
-            completed = self._path_gen.verify_path(self.start, self.end)
+            with metrics.timed("solved"):
+                completed = self.connectivity.connected(self.start.index, self.end.index)
             if cache:
                 self.path_completed = completed
             return completed
@@ -209,149 +247,312 @@ class Game:
 
         The pregenerated path is stored in `self.path`
         """
+        if self.generator == "spanning_tree":
+            self.path = SpanningTreeGenerator(self.grid, self.rng).generate(self.start, self.end)
+            self.path_attempts = 1
+            self.connectivity.rebuild()
+            return
+
         cell_count = self.grid.dimensions.height * self.grid.dimensions.width
         straight_distance = abs(self.start.x_pos - self.end.x_pos) + abs(
             self.start.y_pos - self.end.y_pos
         )
 
-        self.path = self._path_gen.generate_path(self.start, self.end)
-        # regenerate the path if it fills up too much space or is too straight
-        while (
-            len(self.path) > cell_count * 0.75
-            or len(self.path) < straight_distance * 1.2
-        ):
-            self.path = self._path_gen.generate_path(self.start, self.end)
+        # the path shouldn't fill up too much space or be too straight
+        self.path, self.path_attempts = self._path_gen.generate_path_with_length(
+            self.start, self.end, math.ceil(straight_distance * 1.2), int(cell_count * 0.75)
+        )
 
         for cell1, cell2 in more_itertools.windowed(self.path, 2):
             self.grid.create_cell_opening(cell1, cell2)
 
         # randomize openings of non path cells
-        while self.solved(cache=False):
-            for cell in set(more_itertools.flatten(self.grid.cells)).difference(
-                self.path
-            ):
-                if random.random() < 0.80:
-                    for opening_dir in random.sample(
-                        list(grid.Direction), random.randrange(2, 5)
+        path_indices = {cell.index for cell in self.path}
+        free_indices = [index for index in range(len(self.grid)) if index not in path_indices]
+        self.connectivity.rebuild()
+        # Checked without `solved` so the solved metric only holds the checks made while playing
+        while self.connectivity.connected(self.start.index, self.end.index):
+            for index in free_indices:
+                if self.rng.random() < 0.80:
+                    for opening_dir in self.rng.sample(
+                        list(grid.Direction), self.rng.randrange(2, 5)
                     ):
-                        cell.openings.reverse_opening(opening_dir)
-                        if (
-                            (
-                                neighbour := self.grid.cell_in_direction(
-                                    cell, opening_dir
-                                )
-                            )
-                            is not None
-                            and neighbour is not self.start
-                            and neighbour is not self.end
-                        ):
-                            neighbour.openings.reverse_opening(opening_dir.opposite())
+                        self.grid.reverse_opening(index, opening_dir)
+                        neighbour = self.grid.neighbour_index(index, opening_dir)
+                        if neighbour not in (-1, self.start.index, self.end.index):
+                            self.grid.reverse_opening(neighbour, opening_dir.opposite())
 
             # rotate ells randomly
-            for cell in more_itertools.flatten(self.grid.cells):
-                cell.openings.rotate(random.randrange(0, 4))
+            for index in range(len(self.grid)):
+                self.grid.rotate(index, self.rng.randrange(0, 4))
+            self.connectivity.rebuild()
+
+    def _cell_changed(self, index: int) -> None:
+        """Redraw the cell at `index` and its neighbours on the next frame, hiding the hint if it's shown."""
+        self._hide_hint()
+        self.framebuffer.invalidate_index(index)
+
+    def _hide_hint(self) -> None:
+        """Stop highlighting the hint, redrawing its cells on the next frame."""
+        if self._hint_shown:
+            self._hint_shown = False
+            self.framebuffer.invalidate(*self._hint_cells)
+
+
+def _format_duration(seconds: float) -> str:
+    if seconds < 0.001:
+        return f"{seconds * 1_000_000:.0f}µs"
+    return f"{seconds * 1000:.1f}ms"
+
+
+def draw_metrics_overlay(game: Game) -> None:
+    """Draw the frame, solve, hint and generation metrics above the depth in the bottom right corner."""
+    lines = (
+        f"Frame {_format_duration(metrics.last('frame_time'))} "
+        f"p95 {_format_duration(metrics.metric_percentile('frame_time', 95))}",
+        metrics.sparkline("frame_time", METRICS_OVERLAY_WIDTH),
+        f"Bytes {metrics.last('frame_bytes'):.0f} p95 {metrics.metric_percentile('frame_bytes', 95):.0f}",
+        f"Solve {_format_duration(metrics.last('solved'))} "
+        f"p95 {_format_duration(metrics.metric_percentile('solved', 95))}",
+        f"Hint {_format_duration(metrics.last('hint'))}",
+        f"Generated in {_format_duration(game.generation_time)}",
+        f"Path attempts {game.path_attempts}",
+    )
+    top = boxed.terminal.height - 5 - len(lines)
+    for row, line in enumerate(lines, start=top):
+        write(
+            boxed.terminal.move(row, boxed.terminal.width - 26)
+            + boxed.terminal.bright_black(line.ljust(METRICS_OVERLAY_WIDTH)[:METRICS_OVERLAY_WIDTH])
+        )
+
+
+class BoardDelta(typing.NamedTuple):
+    """
+    The changes the player made to a board which isn't on the active chain of games.
+
+    The board itself is generated again from its seed, `rotations` are the rotations of its cells
+    in the format of `Grid.rotations_since` and `children` holds the deltas of the boards of its
+    recursive cells, by the index of the cell.
+    """
+
+    rotations: bytes
+    solved: bool
+    children: dict[int, BoardDelta]
 
 
 class GameTracker:
-    """Keep track of a game and the parent trackers which generated this tracker."""
+    """
+    Keep track of a game and the chain of parent trackers leading to it.
 
-    def __init__(self, game: Game, parent: typing.Optional[GameTracker], cell_size: int):
+    Only the games on the chain from the root to the current depth are kept in memory,
+    the games of other boards are generated again from their seeds when they're entered
+    and the changes made to them are kept as `BoardDelta`s.
+    Games of the recursive cells of the current game are generated in the background by `prefetch_children`
+    so they're usually ready by the time the player enters them.
+    """
+
+    def __init__(
+        self,
+        game: Game,
+        parent: typing.Optional[GameTracker],
+        cell_size: int,
+        cell_index: typing.Optional[int] = None,
+        deltas: typing.Optional[dict[int, BoardDelta]] = None,
+    ):
         self.parent = parent
         self.game = game
-        self._children = {}
+        self.depth = 0 if parent is None else parent.depth + 1
+        # Index of the recursive cell of the parent game this game belongs to
+        self.cell_index = cell_index
+        self._children: dict[int, concurrent.futures.Future[Game]] = {}
+        self.deltas = deltas if deltas is not None else {}
         self._cell_size = cell_size
 
+    def prefetch_children(self) -> None:
+        """Start generating the games of all recursive cells which weren't generated yet."""
+        for cell in self.game.recursive_cells:
+            self._child_game(cell)
+
+    def child_solved(self, cell: grid.Cell) -> bool:
+        """Check if the game of the recursive `cell` was solved."""
+        if cell.index in self.deltas:
+            return self.deltas[cell.index].solved
+        return self._child_game(cell).result().solved()
+
+    def unsolved_children(self) -> list[int]:
+        """Get the indices of the recursive cells whose game wasn't solved yet, they can't be rotated until it is."""
+        return [cell.index for cell in self.game.recursive_cells if not self.child_solved(cell)]
+
     def child_tracker(self, cell: grid.Cell) -> GameTracker:
-        """Create a tracker instance based on `cell`."""
-        if cell not in self._children:
-            game = Game(
-                grid.Grid(grid.GridDimensions(self._cell_size, 4, 4)),
-                int(self.game.recursive_child_count // 2.5),
-            )
-            game.start_game()
-            self._children[cell] = game
-        return GameTracker(self._children[cell], self, self._cell_size)
+        """
+        Create a tracker instance based on `cell`, waiting for its game if it's still being generated.
 
-    def get_depth(self) -> int:
-        """Get the depth of this tracker's game."""
-        count = 0
-        parent = self.parent
-        while parent is not None:
-            parent = parent.parent
-            count += 1
-        return count
+        The games generated for the other recursive cells are dropped and their generations which didn't start yet
+        are cancelled, they're generated again when needed.
+        """
+        game = self._child_game(cell).result()
+        for future in self._children.values():
+            future.cancel()
+        self._children.clear()
+        delta = self.deltas.pop(cell.index, None)
+        if delta is not None:
+            game.grid.apply_rotations(delta.rotations)
+            game.path_completed = delta.solved
+        tracker = GameTracker(game, self, self._cell_size, cell.index, delta.children if delta is not None else None)
+        tracker.prefetch_children()
+        return tracker
+
+    def parent_tracker(self) -> GameTracker:
+        """
+        Leave this game for the parent's, keeping the changes made to this game's board as a delta.
 
+        The parent dropped the games of its recursive cells when this game was entered, so they're all generated
+        again in the background, this one included. Only the games on the active chain are kept in memory
+        in exchange for generating the boards next to it again on every return.
+        """
+        rotations = self.game.grid.rotations_since(self.game.initial_openings)
+        if any(rotations) or self.game.path_completed or self.deltas:
+            self.parent.deltas[self.cell_index] = BoardDelta(rotations, self.game.path_completed, self.deltas)
+        self.parent.prefetch_children()
+        return self.parent
+
+    def _child_game(self, cell: grid.Cell) -> concurrent.futures.Future[Game]:
+        """Get the future of the game of `cell`, submitting its generation if it wasn't submitted before."""
+        if cell.index not in self._children:
+            self._children[cell.index] = _prefetch_executor.submit(self._create_child_game, cell.x_pos, cell.y_pos)
+        return self._children[cell.index]
+
+    def _create_child_game(self, x_pos: int, y_pos: int) -> Game:
+        game = Game(
+            grid.Grid(grid.GridDimensions(self._cell_size, 4, 4)),
+            int(self.game.recursive_child_count // 2.5),
+            self.game.generator,
+            derive_seed(self.game.seed, x_pos, y_pos),
+        )
+        game.start_game()
+        return game
 
-def load_screen(cell_size: int, game_width: int, game_height: int, recursive_elements: int) -> bool:
+
+class GameScreen(Screen):
     """
-    Display and start a game.
+    Display and play a game.
 
-    return True if the user won the game, False if they exited
+    Finishes with True if the user won the game, False if they exited.
+    Every pressed key is recorded by `recorder` if it's given.
     """
+
+    def __init__(self, game_tracker: GameTracker, recorder: typing.Optional[Recorder] = None):
+        self.game_tracker = game_tracker
+        self.recorder = recorder
+        self.show_metrics = False
+
+    def draw(self) -> None:
+        """Draw the game of the current depth."""
+        self.game_tracker.game.display(self.game_tracker.depth)
+        if self.show_metrics:
+            draw_metrics_overlay(self.game_tracker.game)
+
+    def on_key(self, key: Keystroke) -> None:
+        """Move the selection, rotate or enter cells and show hints."""
+        if self.recorder is not None:
+            self.recorder.record(key)
+        game_tracker = self.game_tracker
+        if key == "s":
+            if game_tracker.parent is None:
+                self.finish(False)
+                return
+            else:
+                self.game_tracker = game_tracker.parent_tracker()
+                self.game_tracker.game.display(self.game_tracker.depth)
+            sound.play("up-down")
+
+        elif key == "h":
+            game_tracker.game.display_hint(game_tracker.unsolved_children())
+            sound.play("up-down")
+
+        elif key == "p":
+            self.show_metrics = not self.show_metrics
+            if not self.show_metrics:
+                # The overlay may cover parts of the grid
+                game_tracker.game.display(game_tracker.depth)
+
+        elif (
+            key.name
+            and (direction := key.name.removeprefix("KEY_"))
+            in grid.Direction.__members__
+        ):
+            game_tracker.game.move_selection(grid.Direction[direction])
+
+        elif key == " ":
+            sound.play("up-down")
+            if game_tracker.game.current_selection.recursive:
+                if not game_tracker.child_solved(game_tracker.game.current_selection):
+                    self.game_tracker = game_tracker.child_tracker(game_tracker.game.current_selection)
+                    self.game_tracker.game.display(self.game_tracker.depth)
+                else:
+                    game_tracker.game.current_selection.openings.rotate()
+                    game_tracker.game.display_selection()
+            else:
+                game_tracker.game.current_selection.openings.rotate()
+                if game_tracker.game.solved():
+                    if game_tracker.parent is None:
+                        self.finish(True)
+                        return
+                    else:
+                        self.game_tracker = game_tracker.parent_tracker()
+                        self.game_tracker.game.display(self.game_tracker.depth)
+                self.game_tracker.game.display_selection()
+
+        if self.show_metrics:
+            draw_metrics_overlay(self.game_tracker.game)
+
+
+def create_game_tracker(
+    cell_size: int,
+    game_width: int,
+    game_height: int,
+    recursive_elements: int,
+    generator: str = "path",
+    seed: typing.Optional[int] = None,
+) -> GameTracker:
+    """Start a new game and create the tracker of its root."""
     game_tracker = GameTracker(
         Game(
             grid.Grid(
                 grid.GridDimensions(cell_size, game_width, game_height)
             ),
-            recursive_elements
+            recursive_elements,
+            generator,
+            seed,
         ),
         None,
         cell_size
     )
-
-    terminal_size = 0, 0
     game_tracker.game.start_game()
-    while True:
-        with boxed.terminal.hidden_cursor():
-            with boxed.terminal.cbreak():
-                key = boxed.terminal.inkey(timeout=0.1)
+    return game_tracker
 
-                # Resize border if the terminal size gets changed
-                if (boxed.terminal.width, boxed.terminal.height) != terminal_size:
 
-                    game_tracker.game.display(game_tracker.get_depth())
-                    terminal_size = boxed.terminal.width, boxed.terminal.height
+async def load_screen(
+    app: App,
+    game_tracker: GameTracker,
+    save: typing.Optional[typing.Callable[[GameTracker], None]] = None,
+    recorder: typing.Optional[Recorder] = None,
+) -> bool:
+    """
+    Display and play the game of `game_tracker`, recording the pressed keys with `recorder` if it's given.
 
-                if key == "s":
-                    if game_tracker.parent is None:
-                        return False
-                    else:
-                        game_tracker = game_tracker.parent
-                        game_tracker.game.display(game_tracker.get_depth())
-                    Thread(target=lambda: playsound("music/up-down.wav"), daemon=True).start()
-
-                elif key == "h":
-                    game_tracker.game.display_generated_path()
-                    Thread(target=lambda: playsound("music/up-down.wav"), daemon=True).start()
-
-                elif (
-                    key.name
-                    and (direction := key.name.removeprefix("KEY_"))
-                    in grid.Direction.__members__
-                ):
-                    game_tracker.game.move_selection(grid.Direction[direction])
-
-                elif key == " ":
-                    Thread(target=lambda: playsound("music/up-down.wav"), daemon=True).start()
-                    if (
-                        game_tracker.game.current_selection
-                        in game_tracker.game.recursive_cells
-                    ):
-                        child_tracker = game_tracker.child_tracker(
-                            game_tracker.game.current_selection
-                        )
-                        if not child_tracker.game.solved():
-                            game_tracker = child_tracker
-                            game_tracker.game.display(game_tracker.get_depth())
-                        else:
-                            game_tracker.game.current_selection.openings.rotate()
-                            game_tracker.game.display_selection()
-                    else:
-                        game_tracker.game.current_selection.openings.rotate()
-                        if game_tracker.game.solved():
-                            if game_tracker.parent is None:
-                                return True
-                            else:
-                                game_tracker = game_tracker.parent
-                                game_tracker.game.display(game_tracker.get_depth())
-                        game_tracker.game.display_selection()
+    If `save` is given it's called with the tracker of the current game when the user exits the game
+    or interrupts the program, so the session can be continued later.
+    return True if the user won the game, False if they exited
+    """
+    game_tracker.prefetch_children()
+    screen = GameScreen(game_tracker, recorder)
+    try:
+        won = await app.show(screen)
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        if save is not None:
+            save(screen.game_tracker)
+        raise
+    if save is not None and not won:
+        save(screen.game_tracker)
+    return won
@@ -1,22 +1,24 @@
 from pathlib import Path
-from threading import Thread
 from typing import List
 
-from playsound import playsound
+from blessed.keyboard import Keystroke
 
 import boxed
+from boxed import sound
+from boxed.app import App, Screen
 from boxed.border import draw_boundary
+from boxed.frame import write
 
 
 def display_tutorial(lines: List[str]) -> None:
     """Wraps and prints tutorial text"""
-    print(boxed.terminal.clear, end="")
-    print(
+    write(boxed.terminal.clear)
+    write(
         boxed.terminal.move(boxed.terminal.height - 3, boxed.terminal.width - 20)
         + f"Press {boxed.terminal.white_bold}B{boxed.terminal.normal} to go back"
     )
     draw_boundary()
-    print(boxed.terminal.move_xy(2, 2), end="")
+    write(boxed.terminal.move_xy(2, 2))
 
     lines = [
         line.format(
@@ -30,26 +32,29 @@ def display_tutorial(lines: List[str]) -> None:
 
     for line in lines:
         if line.startswith(boxed.terminal.white_underline):
-            print(boxed.terminal.move_down(1) + boxed.terminal.move_x(2), end="")
+            write(boxed.terminal.move_down(1) + boxed.terminal.move_x(2))
 
         for wrapped_line in boxed.terminal.wrap(line, width=boxed.terminal.width - 4):
-            print(wrapped_line, end="")
-            print(boxed.terminal.move_down(1) + boxed.terminal.move_x(2), end="", flush=True)
+            write(wrapped_line, boxed.terminal.move_down(1) + boxed.terminal.move_x(2))
 
 
-def load_screen(file: Path) -> None:
+class TutorialScreen(Screen):
+    """Show the tutorial text of `file` until B is pressed."""
+
+    def __init__(self, file: Path):
+        self.tutorial_text = file.read_text(encoding="utf8").splitlines()
+
+    def draw(self) -> None:
+        """Draw the tutorial text."""
+        display_tutorial(self.tutorial_text)
+
+    def on_key(self, key: Keystroke) -> None:
+        """Go back when B is pressed."""
+        if key == "b":
+            sound.play("up-down")
+            self.finish()
+
+
+async def load_screen(app: App, file: Path) -> None:
     """Callback for loading screen"""
-    tutorial_text = file.read_text(encoding="utf8").splitlines()
-    terminal_size = 0, 0
-    with boxed.terminal.hidden_cursor():
-        with boxed.terminal.cbreak():
-            while True:
-                if terminal_size != (boxed.terminal.width, boxed.terminal.height):
-                    display_tutorial(tutorial_text)
-                    terminal_size = (boxed.terminal.width, boxed.terminal.height)
-
-                if boxed.terminal.inkey(timeout=0.1) == "b":
-                    Thread(
-                        target=lambda: playsound("music/up-down.wav"), daemon=True
-                    ).start()
-                    return
+    await app.show(TutorialScreen(file))
@@ -1,35 +1,48 @@
+from blessed.keyboard import Keystroke
+
 import boxed
+from boxed.app import App, Screen
 from boxed.art import TROPHY
 from boxed.border import draw_boundary
+from boxed.frame import frame, write
 
 
 def display_game_over() -> None:
     """Displayed when game successfully finished"""
-    print(boxed.terminal.clear, end="")
-    print(
-        boxed.terminal.move(boxed.terminal.height - 3, boxed.terminal.width - 20)
-        + f"Press {boxed.terminal.white_bold}B{boxed.terminal.normal} to go back"
-    )
-    print(boxed.terminal.yellow, end="")
-    print(boxed.terminal.move_xy(boxed.terminal.width // 2 - 8, boxed.terminal.height // 2 - 8), end="")
-
-    trophy_lines = TROPHY.splitlines()
-    for row, line in enumerate(trophy_lines):
-        print(
-            boxed.terminal.move_xy(
-                boxed.terminal.width // 2 - len(trophy_lines[0]) // 2,
-                row+boxed.terminal.height // 2 - len(trophy_lines) // 2,
-            ) + line,
-            end="",
+    with frame():
+        write(boxed.terminal.clear)
+        write(
+            boxed.terminal.move(boxed.terminal.height - 3, boxed.terminal.width - 20)
+            + f"Press {boxed.terminal.white_bold}B{boxed.terminal.normal} to go back"
         )
-    print(boxed.terminal.normal, end="")
+        write(boxed.terminal.yellow)
+
+        trophy_lines = TROPHY.splitlines()
+        for row, line in enumerate(trophy_lines):
+            write(
+                boxed.terminal.move_xy(
+                    boxed.terminal.width // 2 - len(trophy_lines[0]) // 2,
+                    row+boxed.terminal.height // 2 - len(trophy_lines) // 2,
+                ) + line
+            )
+        write(boxed.terminal.normal)
+
+        draw_boundary()
+
+
+class VictoryScreen(Screen):
+    """Show the trophy until B is pressed."""
+
+    def draw(self) -> None:
+        """Draw the trophy."""
+        display_game_over()
 
-    draw_boundary()
+    def on_key(self, key: Keystroke) -> None:
+        """Go back when B is pressed."""
+        if key == "b":
+            self.finish()
 
 
-def load_screen() -> None:
+async def load_screen(app: App) -> None:
     """Callback for loading screen"""
-    with boxed.terminal.hidden_cursor():
-        with boxed.terminal.cbreak():
-            while boxed.terminal.inkey() != "b":
-                display_game_over()
+    await app.show(VictoryScreen())
@@ -0,0 +1,24 @@
+import typing
+
+import boxed
+from boxed.layout import layout_cache
+
+
+@layout_cache
+def move_xy(x: int, y: int) -> str:
+    """Get the sequence moving the cursor to `x`, `y`."""
+    return boxed.terminal.move_xy(x, y)
+
+
+@layout_cache
+def move_left() -> str:
+    """Get the sequence moving the cursor one column left."""
+    return boxed.terminal.move_left
+
+
+@layout_cache
+def colour_affixes(colour: typing.Callable[[str], str]) -> tuple[str, str]:
+    """Get the prefix and suffix `colour`, a formatting string of the terminal, wraps text in."""
+    wrapped = colour("")
+    prefix = str(colour) if wrapped.startswith(str(colour)) else ""
+    return prefix, wrapped[len(prefix):]
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import struct
+from pathlib import Path
+
+from boxed import grid
+from boxed.constants import SESSION_PATH
+from boxed.generation import GENERATORS
+from boxed.screens import game
+
+FILE_HEADER = struct.Struct("<4sB")
+FILE_MAGIC = b"BXSS"
+FILE_VERSION = 2
+# generator index, cell size, amount of games on the active chain
+SESSION_HEADER = struct.Struct("<BHH")
+# seed, width, height, difficulty, start index, end index, selection index, solved,
+# index of the recursive cell in the parent game, amount of recursive cells, length of the path
+GAME_HEADER = struct.Struct("<QHHIIIIBIHI")
+# The game headers of the versions which can still be read, version 1 stored the difficulty in two bytes
+GAME_HEADERS = {1: struct.Struct("<QHHHIIIBIHI"), FILE_VERSION: GAME_HEADER}
+RECURSIVE_INDEX = struct.Struct("<I")
+# index of the recursive cell, solved, length of the rotations, amount of child deltas
+DELTA_HEADER = struct.Struct("<IBHH")
+DELTA_COUNT = struct.Struct("<H")
+
+
+class SessionError(Exception):
+    """Raised when a saved session can't be read."""
+
+
+def save(game_tracker: game.GameTracker, path: Path = SESSION_PATH) -> None:
+    """Save the session `game_tracker` is the current game of to `path`, encoded by `encode_session`."""
+    # Written to a temporary file first so an interrupted save doesn't destroy the previous one
+    temporary_path = path.with_name(path.name + ".tmp")
+    temporary_path.write_bytes(encode_session(game_tracker))
+    temporary_path.replace(path)
+
+
+def load(path: Path = SESSION_PATH) -> game.GameTracker:
+    """
+    Load the session saved to `path` by `save`, returning the tracker of its current game.
+
+    The children of the current game aren't generated yet, they can be started with `GameTracker.prefetch_children`.
+    """
+    try:
+        return decode_session(memoryview(path.read_bytes()))
+    except SessionError as error:
+        raise SessionError(f"{path}: {error}") from error
+
+
+def encode_session(game_tracker: game.GameTracker) -> bytes:
+    """
+    Encode the session `game_tracker` is the current game of.
+
+    The games on the chain from the root to `game_tracker` are stored whole, so they're restored without generating
+    them, with their boards as the initial openings packed by `Grid.packed_openings` and the rotations since.
+    The boards of other explored cells are only stored as their `BoardDelta`s, they're generated from their seeds
+    once they're entered again.
+    """
+    chain = []
+    while game_tracker is not None:
+        chain.append(game_tracker)
+        game_tracker = game_tracker.parent
+    chain.reverse()
+    root = chain[0].game
+    data = [
+        FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION),
+        SESSION_HEADER.pack(GENERATORS.index(root.generator), root.grid.dimensions.cell_size, len(chain)),
+    ]
+    for tracker in chain:
+        data.append(encode_game(tracker))
+        data.append(encode_deltas(tracker.deltas))
+    return b"".join(data)
+
+
+def decode_session(data: memoryview) -> game.GameTracker:
+    """Decode the session encoded by `encode_session`, returning the tracker of its current game."""
+    try:
+        magic, version = FILE_HEADER.unpack_from(data)
+        if magic != FILE_MAGIC:
+            raise SessionError("not a saved session")
+        if version not in GAME_HEADERS:
+            raise SessionError(f"saved by an unsupported version {version}")
+        offset = FILE_HEADER.size
+        generator_index, cell_size, chain_length = SESSION_HEADER.unpack_from(data, offset)
+        offset += SESSION_HEADER.size
+        generator = GENERATORS[generator_index]
+
+        game_tracker = None
+        for _ in range(chain_length):
+            restored_game, cell_index, offset = decode_game(data, offset, cell_size, generator, GAME_HEADERS[version])
+            deltas, offset = decode_deltas(data, offset)
+            game_tracker = game.GameTracker(
+                restored_game, game_tracker, cell_size, cell_index if game_tracker is not None else None, deltas
+            )
+    except (struct.error, IndexError, ValueError) as error:
+        raise SessionError(f"damaged session: {error}") from error
+    if game_tracker is None:
+        raise SessionError("the session holds no games")
+    return game_tracker
+
+
+def encode_game(game_tracker: game.GameTracker) -> bytes:
+    """
+    Encode the game of `game_tracker`.
+
+    The game is stored as a `GAME_HEADER`, the indices of the recursive cells,
+    the path packed by `pack_path`, the initial openings packed by `Grid.packed_openings`
+    and the rotations made since in the format of `Grid.rotations_since`.
+    """
+    encoded_game = game_tracker.game
+    dimensions = encoded_game.grid.dimensions
+    return b"".join(
+        (
+            GAME_HEADER.pack(
+                encoded_game.seed,
+                dimensions.width,
+                dimensions.height,
+                encoded_game.recursive_child_count,
+                encoded_game.start.index,
+                encoded_game.end.index,
+                encoded_game.current_selection.index,
+                encoded_game.path_completed,
+                game_tracker.cell_index or 0,
+                len(encoded_game.recursive_cells),
+                len(encoded_game.path),
+            ),
+            *(RECURSIVE_INDEX.pack(cell.index) for cell in encoded_game.recursive_cells),
+            pack_path(encoded_game.path),
+            encoded_game.initial_openings,
+            encoded_game.grid.rotations_since(encoded_game.initial_openings),
+        )
+    )
+
+
+def decode_game(
+    data: memoryview, offset: int, cell_size: int, generator: str, header: struct.Struct
+) -> tuple[game.Game, int, int]:
+    """
+    Decode the game encoded by `encode_game` at `offset` of `data`.
+
+    `header` is the game header of the version the game was saved by, from `GAME_HEADERS`.
+
+    Return the game, the index of its cell in the parent game and the offset after it.
+    """
+    (
+        seed, width, height, difficulty, start_index, end_index,
+        selection_index, solved, cell_index, recursive_count, path_length,
+    ) = header.unpack_from(data, offset)
+    offset += header.size
+    recursive_indices = [
+        RECURSIVE_INDEX.unpack_from(data, offset + position * RECURSIVE_INDEX.size)[0]
+        for position in range(recursive_count)
+    ]
+    offset += recursive_count * RECURSIVE_INDEX.size
+
+    dimensions = grid.GridDimensions(cell_size, width, height)
+    cell_count = width * height
+    path_size = (path_length + 2) // 4
+    path_indices = unpack_path(data[offset:offset + path_size], start_index, path_length, width)
+    offset += path_size
+    initial_openings = bytes(data[offset:offset + (cell_count + 1) // 2])
+    offset += (cell_count + 1) // 2
+    rotations = bytes(data[offset:offset + (cell_count + 3) // 4])
+    offset += (cell_count + 3) // 4
+    if len(rotations) != (cell_count + 3) // 4:
+        raise ValueError("the board is cut off")
+
+    restored_game = game.Game(grid.Grid(dimensions), difficulty, generator, seed)
+    restored_game.restore_game(start_index, end_index, path_indices, recursive_indices, initial_openings, rotations)
+    restored_game.current_selection = restored_game.grid.cell(selection_index)
+    restored_game.path_completed = bool(solved)
+    return restored_game, cell_index, offset
+
+
+def encode_deltas(deltas: dict[int, game.BoardDelta]) -> bytes:
+    """
+    Encode the deltas of explored boards.
+
+    The amount of deltas is followed by every delta as a `DELTA_HEADER`, its rotations and its children's deltas.
+    """
+    return DELTA_COUNT.pack(len(deltas)) + _encode_delta_items(deltas)
+
+
+def decode_deltas(data: memoryview, offset: int) -> tuple[dict[int, game.BoardDelta], int]:
+    """Decode the deltas encoded by `encode_deltas` at `offset` of `data`, returning them and the offset after them."""
+    (count,) = DELTA_COUNT.unpack_from(data, offset)
+    return _decode_delta_items(data, offset + DELTA_COUNT.size, count)
+
+
+def _encode_delta_items(deltas: dict[int, game.BoardDelta]) -> bytes:
+    return b"".join(
+        DELTA_HEADER.pack(cell_index, delta.solved, len(delta.rotations), len(delta.children))
+        + delta.rotations
+        + _encode_delta_items(delta.children)
+        for cell_index, delta in deltas.items()
+    )
+
+
+def _decode_delta_items(data: memoryview, offset: int, count: int) -> tuple[dict[int, game.BoardDelta], int]:
+    deltas = {}
+    for _ in range(count):
+        cell_index, solved, rotations_length, child_count = DELTA_HEADER.unpack_from(data, offset)
+        offset += DELTA_HEADER.size
+        rotations = bytes(data[offset:offset + rotations_length])
+        offset += rotations_length
+        children, offset = _decode_delta_items(data, offset, child_count)
+        deltas[cell_index] = game.BoardDelta(rotations, bool(solved), children)
+    return deltas, offset
+
+
+def pack_path(path: list[grid.Cell]) -> bytes:
+    """Pack the directions between the cells of `path` four steps per byte, the first step in the lowest two bits."""
+    packed = bytearray((len(path) + 2) // 4)
+    for step, (cell1, cell2) in enumerate(zip(path, path[1:])):
+        packed[step // 4] |= grid.Grid.get_direction_between(cell1, cell2) << (step % 4 * 2)
+    return bytes(packed)
+
+
+def unpack_path(packed: bytes, start_index: int, length: int, width: int) -> list[int]:
+    """Get the indices of the `length` cells of the path packed by `pack_path` which starts at `start_index`."""
+    offsets = {grid.Direction.UP: -width, grid.Direction.RIGHT: 1, grid.Direction.DOWN: width, grid.Direction.LEFT: -1}
+    indices = [start_index]
+    for step in range(length - 1):
+        indices.append(indices[-1] + offsets[packed[step // 4] >> (step % 4 * 2) & 0b11])
+    return indices
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import collections.abc
+import heapq
+import time
+import typing
+
+from boxed.grid import (
+    OPENINGS_MASK, ROTATABLE_FLAG, ROTATED_MASKS, Direction, Grid
+)
+
+# Seconds a hint may take before the best partial answer is returned
+HINT_BUDGET = 0.05
+# The clock is only checked every this many expanded states
+_BUDGET_CHECK_INTERVAL = 256
+
+# _PRESSES[mask][side1][side2] is the fewest clockwise rotations after which an opening `mask`
+# has openings on both sides, or None if it never does.
+_PRESSES = tuple(
+    tuple(
+        tuple(
+            next((n for n in range(4) if ROTATED_MASKS[n][mask] >> side1 & ROTATED_MASKS[n][mask] >> side2 & 1), None)
+            for side2 in range(4)
+        )
+        for side1 in range(4)
+    )
+    for mask in range(16)
+)
+
+
+class Hint(typing.NamedTuple):
+    """
+    Rotations which connect a path of cells.
+
+    `rotations` maps indices of cells to the amount of times they have to be rotated,
+    `path` are the indices of the connected cells from the start.
+    The hint is `complete` if the path reaches the end, or the best partial path if no solution was found in time.
+    """
+
+    rotations: dict[int, int]
+    path: list[int]
+    complete: bool
+
+    @property
+    def presses(self) -> int:
+        """The amount of rotations the hint takes."""
+        return sum(self.rotations.values())
+
+
+def _presses(state: int, side1: int, side2: int) -> typing.Optional[int]:
+    """Get the fewest rotations after which the cell with `state` has openings on `side1` and `side2`."""
+    presses = _PRESSES[state & OPENINGS_MASK][side1][side2]
+    if presses and not state & ROTATABLE_FLAG:
+        return None
+    return presses
+
+
+def solve(
+    board: Grid, start: int, end: int, budget: float = HINT_BUDGET, fixed: collections.abc.Collection[int] = ()
+) -> Hint:
+    """
+    Find the rotations which connect the cells at `start` and `end` of `board` with the fewest presses.
+
+    The search runs over cells and the side they're entered from, with the rotations of a cell costing
+    the presses needed to open it towards the side it's entered from and the side it's left through.
+    The fewest presses found for every state are kept and costlier ways into it are pruned,
+    and a path never enters a cell it already passed through.
+    The start is entered from the left and the end only needs to be open towards the side it's entered from.
+    The cells at the indices in `fixed` are treated as if they couldn't be rotated, like recursive cells
+    whose child puzzle wasn't solved yet.
+    If no solution is found within `budget` seconds, the path that got closest to the end is returned.
+    """
+    deadline = time.perf_counter() + budget
+    states = board.states
+    fixed_states = {index: states[index] & ~ROTATABLE_FLAG for index in fixed}
+    neighbours = board.neighbours
+    width = board.dimensions.width
+    end_y, end_x = divmod(end, width)
+
+    start_state = (start, Direction.LEFT)
+    best_presses = {start_state: 0}
+    # Every state's previous state and the rotations of the previous cell, and the cells on the path leading to it
+    parents: dict[tuple[int, int], typing.Optional[tuple[tuple[int, int], int]]] = {start_state: None}
+    visited = {start_state: 1 << start}
+    queue = [(0, start, Direction.LEFT)]
+    closest, closest_key = start_state, (float("inf"), 0)
+    expanded = 0
+
+    while queue:
+        presses, index, entry = heapq.heappop(queue)
+        state = (index, entry)
+        if presses > best_presses[state]:
+            continue
+        if index == end:
+            return _hint(parents, state, _presses(fixed_states.get(end, states[end]), entry, entry), complete=True)
+
+        y_pos, x_pos = divmod(index, width)
+        if (key := (abs(x_pos - end_x) + abs(y_pos - end_y), presses)) < closest_key:
+            closest, closest_key = state, key
+        expanded += 1
+        if not expanded % _BUDGET_CHECK_INTERVAL and time.perf_counter() > deadline:
+            break
+
+        path_cells = visited[state]
+        cell_state = fixed_states.get(index, states[index])
+        for exit_side in range(4):
+            if exit_side == entry or (neighbour := neighbours[exit_side][index]) == -1 or path_cells >> neighbour & 1:
+                continue
+            cell_presses = _presses(cell_state, entry, exit_side)
+            if cell_presses is None:
+                continue
+            neighbour_entry = exit_side ^ 2
+            total = presses + cell_presses
+            if neighbour == end:
+                end_presses = _presses(fixed_states.get(end, states[end]), neighbour_entry, neighbour_entry)
+                if end_presses is None:
+                    continue
+                total += end_presses
+            neighbour_state = (neighbour, neighbour_entry)
+            if total < best_presses.get(neighbour_state, total + 1):
+                best_presses[neighbour_state] = total
+                parents[neighbour_state] = (state, cell_presses)
+                visited[neighbour_state] = path_cells | 1 << neighbour
+                heapq.heappush(queue, (total, neighbour, neighbour_entry))
+
+    closest_state = fixed_states.get(closest[0], states[closest[0]])
+    return _hint(parents, closest, _presses(closest_state, closest[1], closest[1]) or 0, complete=False)
+
+
+def _hint(
+    parents: dict[tuple[int, int], typing.Optional[tuple[tuple[int, int], int]]],
+    state: tuple[int, int],
+    last_presses: int,
+    *,
+    complete: bool,
+) -> Hint:
+    """Follow the parents of `state` back to the start, the cell of `state` taking `last_presses` rotations."""
+    rotations = {}
+    path = []
+    presses = last_presses
+    while True:
+        index = state[0]
+        path.append(index)
+        if presses:
+            rotations[index] = presses
+        if parents[state] is None:
+            break
+        state, presses = parents[state]
+    path.reverse()
+    return Hint(rotations, path, complete)
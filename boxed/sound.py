@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import importlib.util
+import os
+import queue
+import threading
+import typing
+import wave
+from pathlib import Path
+
+SOUND_DIRECTORY = Path("music")
+SOUNDS = {"up-down": SOUND_DIRECTORY / "up-down.wav"}
+
+
+class NullBackend:
+    """Play nothing, used when audio is disabled or not available."""
+
+    def load(self, path: Path) -> object:
+        """Pretend to load the sound at `path`."""
+        return None
+
+    def play(self, sound: object) -> None:
+        """Pretend to play `sound`."""
+
+
+class PlaysoundBackend:
+    """
+    Play sounds through playsound.
+
+    playsound can only play a file given its path, so the sound's bytes can't be preloaded.
+    Loading imports playsound and resolves the path up front, so a missing file or library is found before the first
+    play, which still has playsound read the file.
+    """
+
+    def __init__(self):
+        self._playsound: typing.Optional[typing.Callable[[str], None]] = None
+
+    def load(self, path: Path) -> str:
+        """Check the sound at `path` can be played and get the absolute path playsound plays it from."""
+        if self._playsound is None:
+            from playsound import playsound
+
+            self._playsound = playsound
+        return str(path.resolve(strict=True))
+
+    def play(self, sound: str) -> None:
+        """Play `sound`, blocking until it finishes."""
+        self._playsound(sound)
+
+
+class WaveSound(typing.NamedTuple):
+    """A decoded wave file."""
+
+    frames: bytes
+    channels: int
+    sample_width: int
+    frame_rate: int
+
+
+class SimpleaudioBackend:
+    """Play sounds decoded into memory once through simpleaudio."""
+
+    def load(self, path: Path) -> WaveSound:
+        """Decode the wave file at `path`."""
+        with wave.open(str(path), "rb") as file:
+            return WaveSound(
+                file.readframes(file.getnframes()), file.getnchannels(), file.getsampwidth(), file.getframerate()
+            )
+
+    def play(self, sound: WaveSound) -> None:
+        """Play `sound`, blocking until it finishes."""
+        import simpleaudio
+
+        simpleaudio.play_buffer(*sound).wait_done()
+
+
+def create_backend() -> typing.Union[NullBackend, PlaysoundBackend, SimpleaudioBackend]:
+    """
+    Create the best available audio backend.
+
+    Audio can be disabled by setting the BOXED_AUDIO environment variable to 0.
+    The audio libraries are only imported on the worker thread, once the sounds are loaded or played.
+    """
+    if os.environ.get("BOXED_AUDIO") == "0":
+        return NullBackend()
+    if importlib.util.find_spec("simpleaudio") is not None:
+        return SimpleaudioBackend()
+    return PlaysoundBackend()
+
+
+class SoundPlayer:
+    """
+    Play sounds from a single worker thread.
+
+    The backend is created by `backend_factory` and the sounds are loaded on the worker thread when it starts,
+    so none of it delays the caller. At most one sound waits while another is playing,
+    sounds requested while the queue is full are dropped so holding a key down doesn't queue up sounds.
+    The player goes silent if its backend fails to load or play.
+    """
+
+    def __init__(
+        self,
+        backend_factory: typing.Callable[[], typing.Union[NullBackend, PlaysoundBackend, SimpleaudioBackend]],
+    ):
+        self.backend: typing.Union[NullBackend, PlaysoundBackend, SimpleaudioBackend, None] = None
+        self._backend_factory = backend_factory
+        self._sounds = {}
+        self._queue: queue.Queue[str] = queue.Queue(maxsize=1)
+        self._worker = None
+
+    def start(self) -> None:
+        """Start the worker thread, which creates the backend and loads the sounds, if it isn't running yet."""
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._play_queued, name="boxed-sound", daemon=True)
+            self._worker.start()
+
+    def play(self, name: str) -> None:
+        """Play the sound `name` unless a sound is already waiting to be played."""
+        if isinstance(self.backend, NullBackend):
+            return
+        self.start()
+        try:
+            self._queue.put_nowait(name)
+        except queue.Full:
+            pass
+
+    def _play_queued(self) -> None:
+        try:
+            backend = self._backend_factory()
+            self._sounds = {name: backend.load(path) for name, path in SOUNDS.items()}
+        except (ImportError, OSError, wave.Error):
+            backend = NullBackend()
+        self.backend = backend
+        while True:
+            name = self._queue.get()
+            try:
+                self.backend.play(self._sounds[name])
+            except Exception:
+                self.backend = NullBackend()
+
+
+_player = SoundPlayer(create_backend)
+
+
+def preload() -> None:
+    """Create the audio backend and load the sounds in the background, before the first sound is played."""
+    _player.start()
+
+
+def play(name: str) -> None:
+    """Play the sound `name` through the shared player."""
+    _player.play(name)
@@ -1,17 +1,65 @@
+from blessed.keyboard import Keystroke
+
 import boxed
+from boxed.app import App, Screen
 from boxed.border import draw_boundary
+from boxed.frame import write
+
+INVALID_INPUT_MESSAGE = "Invalid input!"
+
+
+class IntInputScreen(Screen):
+    """Ask for integer input with `prompt` positioned at `x`, `y`, finishing with the entered integer."""
+
+    def __init__(self, prompt: str, x: int, y: int):
+        self.prompt = prompt
+        self.x = x
+        self.y = y
+        self.text = ""
+        self.invalid = False
+        self._drawn_length = 0
+
+    def draw(self) -> None:
+        """Draw the prompt with the text entered so far."""
+        write(boxed.terminal.clear)
+        draw_boundary()
+        self._drawn_length = 0
+        self.draw_input()
+
+    def draw_input(self) -> None:
+        """Draw the entered text with a cursor after it, and a message if the last entered text wasn't an integer."""
+        line = self.prompt + self.text
+        write(
+            boxed.terminal.move_xy(self.x, self.y)
+            + line
+            + boxed.terminal.reverse(" ")
+            + " " * max(self._drawn_length - len(line), 0)
+            + boxed.terminal.move_xy(self.x, self.y + 1)
+            + (INVALID_INPUT_MESSAGE if self.invalid else " " * len(INVALID_INPUT_MESSAGE))
+        )
+        self._drawn_length = len(line)
+
+    def on_key(self, key: Keystroke) -> None:
+        """Edit the entered text and finish when enter is pressed with a valid integer."""
+        if key.name == "KEY_ENTER":
+            try:
+                self.finish(int(self.text))
+                return
+            except ValueError:
+                self.invalid = True
+                self.text = ""
+
+        elif key.name in ("KEY_BACKSPACE", "KEY_DELETE"):
+            self.text = self.text[:-1]
+
+        elif not key.is_sequence and key.isprintable():
+            self.text += key
+
+        else:
+            return
+        self.draw_input()
 
 
-def get_int_input(prompt: str, x: int, y: int) -> int:
+async def get_int_input(app: App, prompt: str, x: int, y: int) -> int:
     """Ask for integer input with `prompt` positioned at `x`, `y`."""
-    print(boxed.terminal.clear, end="")
-    draw_boundary()
-    previous_input = ""
-    while True:
-        print(boxed.terminal.move_xy(x, y) + " " * len(prompt + previous_input), end="")
-        previous_input = input(boxed.terminal.move_xy(x, y) + prompt)
-        try:
-            return int(previous_input)
-
-        except ValueError:
-            print(boxed.terminal.move_xy(x, y+1) + "Invalid input!")
+    return await app.show(IntInputScreen(prompt, x, y))
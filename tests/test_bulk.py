@@ -0,0 +1,25 @@
+import contextlib
+import io
+import unittest
+
+from boxed import bulk
+
+
+class ParseSizeTests(unittest.TestCase):
+    """Tests of the sizes accepted by the generate command."""
+
+    def test_narrow_boards_are_rejected(self) -> None:
+        """Boards where the start and end would be next to each other don't generate."""
+        for size in ("2x1", "2x5", "1x3"):
+            with self.subTest(size=size), contextlib.redirect_stderr(io.StringIO()):
+                with self.assertRaises(SystemExit):
+                    bulk.main(["--size", size, "--count", "1"])
+
+    def test_parses_size(self) -> None:
+        """Sizes are parsed as WIDTHxHEIGHT."""
+        self.assertEqual(bulk.parse_size("3x1"), (3, 1))
+        self.assertEqual(bulk.parse_size("10X20"), (10, 20))
+
+
+if __name__ == "__main__":
+    unittest.main()
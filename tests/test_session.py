@@ -0,0 +1,45 @@
+import struct
+import unittest
+
+from boxed import session
+from boxed.screens import game
+
+
+class SessionTests(unittest.TestCase):
+    """Tests of encoding and decoding saved sessions."""
+
+    def setUp(self) -> None:
+        """Start a game and rotate one of its cells."""
+        self.game_tracker = game.create_game_tracker(2, 8, 6, 3, "path", 5)
+        self.game_tracker.game.grid.rotate(10, 1)
+
+    def assert_restored(self, data: bytes) -> None:
+        """Check that `data` decodes to the game of `self.game_tracker`."""
+        restored = session.decode_session(memoryview(data)).game
+        original = self.game_tracker.game
+        self.assertEqual(restored.seed, original.seed)
+        self.assertEqual(restored.recursive_child_count, original.recursive_child_count)
+        self.assertEqual(restored.grid.packed_openings(), original.grid.packed_openings())
+        self.assertEqual([cell.index for cell in restored.path], [cell.index for cell in original.path])
+
+    def test_round_trip(self) -> None:
+        """A session decodes to the game it was encoded from."""
+        self.assert_restored(session.encode_session(self.game_tracker))
+
+    def test_large_difficulty(self) -> None:
+        """Difficulties which don't fit in two bytes are saved."""
+        self.game_tracker.game.recursive_child_count = 100_000
+        self.assert_restored(session.encode_session(self.game_tracker))
+
+    def test_version_1(self) -> None:
+        """Sessions saved by version 1 are decoded with its game header."""
+        data = bytearray(session.encode_session(self.game_tracker))
+        struct.pack_into("<B", data, 4, 1)
+        offset = session.FILE_HEADER.size + session.SESSION_HEADER.size
+        fields = session.GAME_HEADER.unpack_from(data, offset)
+        data[offset:offset + session.GAME_HEADER.size] = session.GAME_HEADERS[1].pack(*fields)
+        self.assert_restored(bytes(data))
+
+
+if __name__ == "__main__":
+    unittest.main()
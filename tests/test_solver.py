@@ -0,0 +1,67 @@
+import unittest
+
+from boxed import grid, solver
+from boxed.grid import Direction
+
+
+def _mask(*directions: Direction) -> int:
+    return sum(1 << direction for direction in directions)
+
+
+class SolveTests(unittest.TestCase):
+    """Tests of the hint solver."""
+
+    def setUp(self) -> None:
+        """
+        Create a board with a cheap route along the top row and a costlier one along the bottom row.
+
+        The cell in the middle of the top row is a straight needing a single rotation,
+        the bottom row needs three rotations of its left corner.
+        """
+        self.board = grid.Grid(grid.GridDimensions(1, 3, 2))
+        states = {
+            (0, 0): _mask(Direction.LEFT, Direction.RIGHT, Direction.DOWN),
+            (1, 0): _mask(Direction.UP, Direction.DOWN) | grid.ROTATABLE_FLAG,
+            (2, 0): _mask(Direction.LEFT, Direction.RIGHT, Direction.DOWN),
+            (0, 1): _mask(Direction.RIGHT, Direction.DOWN) | grid.ROTATABLE_FLAG,
+            (1, 1): _mask(Direction.LEFT, Direction.RIGHT) | grid.ROTATABLE_FLAG,
+            (2, 1): _mask(Direction.LEFT, Direction.UP) | grid.ROTATABLE_FLAG,
+        }
+        for (x_pos, y_pos), state in states.items():
+            self.board.states[self.board.cell_at(x_pos, y_pos).index] = state
+        self.start = self.board.cell_at(0, 0).index
+        self.end = self.board.cell_at(2, 0).index
+        self.middle = self.board.cell_at(1, 0)
+
+    def test_fewest_presses(self) -> None:
+        """The route taking the fewest rotations is picked."""
+        hint = solver.solve(self.board, self.start, self.end)
+        self.assertTrue(hint.complete)
+        self.assertEqual(hint.rotations, {self.middle.index: 1})
+        self.assertEqual(hint.path, [self.start, self.middle.index, self.end])
+
+    def test_unsolved_recursive_cell_is_fixed(self) -> None:
+        """A recursive cell whose game wasn't solved can't be rotated, so the costlier route is picked."""
+        self.middle.recursive = True
+        hint = solver.solve(self.board, self.start, self.end, fixed=[self.middle.index])
+        self.assertTrue(hint.complete)
+        self.assertEqual(hint.presses, 3)
+        self.assertNotIn(self.middle.index, hint.path)
+
+    def test_rotations_connect_board(self) -> None:
+        """Applying the hint's rotations connects the start to the end."""
+        for fixed in ((), (self.middle.index,)):
+            with self.subTest(fixed=fixed):
+                board = grid.Grid(self.board.dimensions)
+                board.states[:] = self.board.states
+                hint = solver.solve(board, self.start, self.end, fixed=fixed)
+                for index, presses in hint.rotations.items():
+                    board.rotate(index, presses)
+                for cell1, cell2 in zip(hint.path, hint.path[1:]):
+                    direction = grid.Grid.get_direction_between(board.cell(cell1), board.cell(cell2))
+                    self.assertIn(direction, board.cell(cell1).openings)
+                    self.assertIn(direction.opposite(), board.cell(cell2).openings)
+
+
+if __name__ == "__main__":
+    unittest.main()